@@ -2,8 +2,75 @@
 
 import pygame as pg
 import os
+import sys
+import json
+import threading
+import time
+import weakref
 # --- Use non-relative import for flat structure ---
 from settings import *
+from atlas import load_atlas, build_atlas
+from audio import AudioEngine
+
+class FormatCheckedTarget:
+    """Debug wrapper around a frame target: every blit onto it goes through Assets.check_format.
+
+    Warnings are labelled with the file and line of the blit, so HUD text,
+    popups, panels and transitions show up as well as sprites.
+    """
+    def __init__(self, target, assets):
+        self.target = target
+        self.assets = assets
+
+    def _caller(self):
+        frame = sys._getframe(2)
+        return f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno}"
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        self.assets.check_format(source, self._caller())
+        return self.target.blit(source, dest, area, special_flags)
+
+    def blits(self, blit_sequence, doreturn=True):
+        blit_sequence = list(blit_sequence)
+        label = self._caller()
+        for args in blit_sequence: self.assets.check_format(args[0], label)
+        return self.target.blits(blit_sequence, doreturn)
+
+    def __getattr__(self, name): # fill, get_size, ... go straight to the target
+        return getattr(self.target, name)
+
+def resolve_font(family):
+    """Returns the font file for `family`, cached on disk so fontconfig only runs once."""
+    cache = {}
+    try:
+        with open(FONT_CACHE_FILE, 'r') as f:
+            cache = json.load(f)
+    except (IOError, json.JSONDecodeError):
+        cache = {}
+
+    if family in cache:
+        path = cache[family]
+        if path is None or os.path.exists(path):
+            return path
+
+    path = pg.font.match_font(family) # Slow on a cold fontconfig cache
+    cache[family] = path
+    try:
+        with open(FONT_CACHE_FILE, 'w') as f:
+            json.dump(cache, f, indent=4)
+    except IOError as e:
+        print(f"Warning: Could not write font cache: {e}")
+    return path
+
+def render_gradient(color_top, color_bottom, size):
+    """Renders a vertical gradient as a 1px wide strip and stretches it to `size` in one scale."""
+    width, height = size
+    pixels = bytes(
+        max(0, min(255, int(color_top[c] * (1 - y / height) + color_bottom[c] * (y / height))))
+        for y in range(height) for c in range(3)
+    )
+    strip = pg.image.frombuffer(pixels, (1, height), 'RGB')
+    return pg.transform.scale(strip, (width, height)).convert()
 
 class Assets:
     def __init__(self):
@@ -12,85 +79,217 @@ class Assets:
         self.font_normal = None
         self.font_small = None
         self.font_tiny = None
-        self.sounds_enabled = True
+        self.sounds_enabled = True # The player's preference; only changed on the main thread
+        self.mixer_available = True # Cleared by the loader thread if the mixer or sounds fail
+        self.sound_thread = None
+        self.audio = AudioEngine()
+        self.atlas = None
+        self.atlas_index = {}
         self.bg_surface = None
+        self.bg_colors = None # Gradient waiting to be rendered on first draw
+        self.bg_key = None
+        self.gradient_cache = {} # (color_dark, color_light, size) -> surface
+        self.surface_cache = {} # key -> display-format surface reused across frames
+        self.tint_cache = {} # (image name, color, steps) -> tuple of tinted frames
+        self.native_formats = {} # has_alpha -> (bitsize, masks) of the display format
+        self.format_warnings = set()
+        self.load_failures = 0 # Sounds and images that failed to load
+        self.tracked_surfaces = weakref.WeakSet() # Every live surface made here, for memory diagnostics
 
-    def load(self):
+    def load(self, sounds_enabled=True):
+        self.sounds_enabled = sounds_enabled # Set before the loader thread starts
         # Fonts
+        font_name = resolve_font(FONT_FAMILY)
         try:
-            self.font_normal = pg.font.Font(FONT_NAME, 52)
-            self.font_small = pg.font.Font(FONT_NAME, 36)
-            self.font_tiny = pg.font.Font(FONT_NAME, 24)
-            GAME_FONT = self.font_normal # Assign if needed elsewhere, though maybe not now
+            self.font_normal = pg.font.Font(font_name, 52)
+            self.font_small = pg.font.Font(font_name, 36)
+            self.font_tiny = pg.font.Font(font_name, 24)
         except IOError as e:
-            print(f"Warning: Could not load font {FONT_NAME}. Using default. Error: {e}")
+            print(f"Warning: Could not load font {font_name}. Using default. Error: {e}")
             self.font_normal = pg.font.SysFont(None, 52)
             self.font_small = pg.font.SysFont(None, 36)
             self.font_tiny = pg.font.SysFont(None, 24)
 
-        # Sounds
+        # Sounds load in the background so the menu can show right away
+        self.sound_thread = threading.Thread(target=self._load_sounds, daemon=True)
+        self.sound_thread.start()
+
+        # Sprites
+        self.load_sprites()
+
+        # Background is rendered lazily on first draw
+        self.bg_colors = (BG_COLOR_DARK_START, BG_COLOR_LIGHT_START)
+
+    def _load_sounds(self):
+        start = time.perf_counter()
         try:
             pg.mixer.init()
             # Load only existing sounds
             self._load_sound(COLLECT_SOUND)
             self._load_sound(HIT_SOUND)
-            # --- Removed powerup/levelup sound loading ---
-            # self._load_sound(POWERUP_SOUND)
-            # self._load_sound(LEVELUP_SOUND)
-            print("Sounds loaded.") # Simplified message
+            self.audio.load(self.sounds)
+            print(f"Sounds loaded in {(time.perf_counter() - start) * 1000.0:.1f}ms.")
         except (pg.error, FileNotFoundError) as e:
             print(f"Warning: Could not initialize mixer or load sounds ({e}). Running without sound.")
-            self.sounds_enabled = False
-
-        # Images (Keep placeholder)
-        # self._load_image(PLAYER_IMG)
+            self.mixer_available = False
 
-        # Pre-render initial background
-        self.update_background(BG_COLOR_DARK_START, BG_COLOR_LIGHT_START)
+    def wait_for_sounds(self, timeout=None):
+        """Blocks until background sound loading has finished."""
+        if self.sound_thread:
+            self.sound_thread.join(timeout)
 
     def _load_sound(self, filename):
-        if not self.sounds_enabled or not filename: return # Added check for empty filename
+        if not filename: return # Added check for empty filename. Loaded even with sound off, so it can be turned on later
         path = os.path.join(SOUND_DIR, filename)
         try:
             sound = pg.mixer.Sound(path)
             # Use filename without extension as key
             self.sounds[os.path.splitext(filename)[0]] = sound
         except (pg.error, FileNotFoundError) as e:
+            self.load_failures += 1
             print(f"Warning: Could not load sound '{filename}'. Error: {e}")
 
+    def load_sprites(self):
+        """Loads the baked sprite atlas and serves each look as a subsurface of it."""
+        resolution = (SCREEN_WIDTH, SCREEN_HEIGHT)
+        loaded = load_atlas(resolution)
+        if loaded is None:
+            print("Building sprite atlas in memory. Run 'python atlas.py' to bake it.")
+            loaded = build_atlas(resolution)
+        atlas_surface, index = loaded
+        self.atlas = self.track(atlas_surface.convert_alpha())
+        self.atlas_index = index
+        for name, rect in index.items():
+            self.images[name] = self.atlas.subsurface(rect)
+
     def _load_image(self, filename):
         if not filename: return
         path = os.path.join(IMG_DIR, filename)
         try:
-            image = pg.image.load(path).convert_alpha()
+            image = self.track(pg.image.load(path).convert_alpha())
             self.images[os.path.splitext(filename)[0]] = image
         except (pg.error, FileNotFoundError) as e:
+            self.load_failures += 1
             print(f"Warning: Could not load image '{filename}'. Error: {e}")
 
     def play_sound(self, name):
         # Map simplified names to potentially loaded filenames
         sound_key = name # Assume name matches the key used during load
-        if self.sounds_enabled and sound_key in self.sounds:
-            self.sounds[sound_key].play()
+        if self.sounds_enabled and self.mixer_available: self.audio.play(sound_key)
+
+    def metrics_counters(self):
+        return {
+            "game_assets_sounds_loaded": len(self.sounds),
+            "game_assets_load_failures_total": self.load_failures,
+            "game_assets_cached_surfaces": len(self.surface_cache) + len(self.gradient_cache) + len(self.tint_cache),
+            "game_assets_format_warnings": len(self.format_warnings),
+            "game_audio_sounds_played_total": self.audio.played,
+            "game_audio_voices_stolen_total": self.audio.stolen,
+            "game_audio_sounds_dropped_total": self.audio.dropped + self.audio.limited,
+        }
 
     def get_image(self, name):
         return self.images.get(name, None)
 
+    def get_tint_frames(self, name, color, steps=PLAYER_FLASH_STEPS):
+        """Returns image `name` with `color` added at `steps` increasing strengths, built once per combination."""
+        key = (name, tuple(color), steps)
+        frames = self.tint_cache.get(key)
+        if frames is None:
+            base = self.get_image(name)
+            if base is None: return ()
+            frames = []
+            for step in range(1, steps + 1):
+                frame = self.track(base.copy())
+                strength = PLAYER_FLASH_ALPHA * step / (255 * steps)
+                # RGB only: per-pixel alpha is kept, so transparent pixels stay transparent
+                frame.fill(tuple(int(c * strength) for c in color[:3]), special_flags=pg.BLEND_RGB_ADD)
+                frames.append(frame)
+            frames = tuple(frames)
+            self.tint_cache[key] = frames
+        return frames
+
     def update_background(self, color_dark, color_light):
-        """Pre-renders the background gradient to a surface."""
-        self.bg_surface = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
-        for y in range(SCREEN_HEIGHT):
-            color_ratio = y / SCREEN_HEIGHT
-            color = (
-                int(color_dark[0] * (1 - color_ratio) + color_light[0] * color_ratio),
-                int(color_dark[1] * (1 - color_ratio) + color_light[1] * color_ratio),
-                int(color_dark[2] * (1 - color_ratio) + color_light[2] * color_ratio)
-            )
-            color = tuple(max(0, min(255, c)) for c in color)
-            self.bg_surface.fill(color, (0, y, SCREEN_WIDTH, 1))
+        """Selects the background gradient, rendering each (colors, resolution) only once."""
+        size = (SCREEN_WIDTH, SCREEN_HEIGHT)
+        key = (tuple(color_dark), tuple(color_light), size)
+        surface = self.gradient_cache.get(key)
+        if surface is None:
+            surface = self.track(render_gradient(color_dark, color_light, size))
+            self.gradient_cache[key] = surface
+        self.bg_key = key
+        self.bg_surface = surface
 
     def draw_background(self, surface):
+        if self.bg_surface is None and self.bg_colors:
+            self.update_background(*self.bg_colors)
         if self.bg_surface:
+            self.check_format(self.bg_surface, "background")
             surface.blit(self.bg_surface, (0, 0))
         else:
-             surface.fill(BG_COLOR_DARK_START)
\ No newline at end of file
+             surface.fill(BG_COLOR_DARK_START)
+
+    # --- Display-format surfaces ---
+
+    def create_surface(self, size, alpha=False):
+        """Creates a surface already in the display's pixel format."""
+        surface = pg.Surface(size, pg.SRCALPHA if alpha else 0)
+        return self.track(surface.convert_alpha() if alpha else surface.convert())
+
+    def to_display_format(self, surface):
+        """Converts `surface` (e.g. rendered text) to the display format, keeping per-pixel alpha."""
+        if surface.get_flags() & pg.SRCALPHA:
+            return self.track(surface.convert_alpha())
+        return self.track(surface.convert())
+
+    def cached_surface(self, key, size, alpha=False, fill=None):
+        """Returns a display-format surface that is created once and reused every frame."""
+        surface = self.surface_cache.get(key)
+        if surface is None:
+            surface = self.create_surface(size, alpha)
+            if fill is not None: surface.fill(fill)
+            self.surface_cache[key] = surface
+        return surface
+
+    def get_panel(self, size, color):
+        """Returns a cached translucent panel, as used behind HUD and menu text."""
+        return self.cached_surface(("panel", size, color), size, alpha=True, fill=color)
+
+    def on_display_changed(self):
+        """Re-converts every cached surface after the display mode changed."""
+        self.native_formats = {}
+        self.surface_cache = {key: self.to_display_format(s) for key, s in self.surface_cache.items()}
+        self.gradient_cache = {key: self.track(s.convert()) for key, s in self.gradient_cache.items()}
+        self.tint_cache = {}
+        if self.bg_key in self.gradient_cache:
+            self.bg_surface = self.gradient_cache[self.bg_key]
+        if self.atlas:
+            self.atlas = self.track(self.atlas.convert_alpha())
+            for name, rect in self.atlas_index.items():
+                self.images[name] = self.atlas.subsurface(rect)
+
+    def track(self, surface):
+        """Registers `surface` for memory accounting and returns it."""
+        self.tracked_surfaces.add(surface)
+        return surface
+
+    def surface_stats(self):
+        """Returns (count, pixel bytes) of the tracked surfaces that are still alive."""
+        surfaces = list(self.tracked_surfaces)
+        return len(surfaces), sum(s.get_width() * s.get_height() * s.get_bytesize() for s in surfaces)
+
+    def debug_target(self, target):
+        """Returns `target`, wrapped so its blits are format-checked when SURFACE_FORMAT_DEBUG is on."""
+        return FormatCheckedTarget(target, self) if SURFACE_FORMAT_DEBUG else target
+
+    def check_format(self, surface, label):
+        """With SURFACE_FORMAT_DEBUG on, warns once per label about blits that need a format conversion."""
+        if not SURFACE_FORMAT_DEBUG or label in self.format_warnings: return
+        has_alpha = surface.get_masks()[3] != 0 # Per-pixel alpha; set_alpha() alone also sets SRCALPHA
+        if has_alpha not in self.native_formats:
+            reference = self.create_surface((1, 1), has_alpha)
+            self.native_formats[has_alpha] = (reference.get_bitsize(), reference.get_masks())
+        if (surface.get_bitsize(), surface.get_masks()) != self.native_formats[has_alpha]:
+            self.format_warnings.add(label)
+            print(f"Warning: Blit from non-native surface format ({label}): "
+                  f"{surface.get_bitsize()} bit, masks {surface.get_masks()}")
@@ -0,0 +1,184 @@
+# atlas.py
+#
+# Offline bake step for the sprite atlas. Every sprite look is drawn once,
+# packed into a single image and described by a JSON index:
+#
+#     python atlas.py                      # bake for SCREEN_WIDTH x SCREEN_HEIGHT
+#     python atlas.py 800x900 1600x1800    # bake for several target resolutions
+#
+# At runtime Assets loads the atlas matching the current resolution and
+# serves subsurfaces of it. If no baked atlas exists, it is built in memory.
+
+import pygame as pg
+import os
+import sys
+import json
+# --- Use non-relative import for flat structure ---
+from settings import *
+
+ATLAS_PADDING = 1
+ATLAS_MAX_WIDTH = 256
+
+def atlas_paths(resolution):
+    """Returns the (image, index) paths of the atlas for `resolution`."""
+    name = f"atlas_{resolution[0]}x{resolution[1]}"
+    return os.path.join(IMG_DIR, name + ".png"), os.path.join(IMG_DIR, name + ".json")
+
+def pulse_sizes(base_size):
+    """All sizes a pulsing collectible of `base_size` can be drawn at."""
+    return range(int(base_size * (1 - COLLECTIBLE_PULSE_AMOUNT)), int(base_size * (1 + COLLECTIBLE_PULSE_AMOUNT)) + 1)
+
+# --- Sprite looks ---
+
+def draw_player(size, color):
+    """Draws the player triangle with gradient, outline and highlight."""
+    width, height = size
+    image = pg.Surface(size, pg.SRCALPHA)
+
+    # Main body (rounded triangle)
+    points = [
+        (width // 2, 0),  # Top point
+        (0, height),      # Bottom left
+        (width, height)   # Bottom right
+    ]
+
+    # Draw main shape with gradient
+    gradient_surface = pg.Surface(size, pg.SRCALPHA)
+    for y in range(height):
+        alpha = int(255 * (1 - y / height * 0.3))  # Fade to slightly transparent
+        pg.draw.line(gradient_surface, (*color, alpha), (0, y), (width, y))
+
+    # Draw the gradient shape
+    mask = pg.Surface(size, pg.SRCALPHA)
+    pg.draw.polygon(mask, (255, 255, 255, 255), points)
+    gradient_surface.blit(mask, (0, 0), special_flags=pg.BLEND_RGBA_MULT)
+    image.blit(gradient_surface, (0, 0))
+
+    # Draw outline with anti-aliasing
+    pg.draw.polygon(image, (*BLACK, 180), points, 2)
+
+    # Add highlight
+    highlight_points = [
+        (width // 2, 2),
+        (width // 4, height // 2),
+        (width * 3 // 4, height // 2)
+    ]
+    pg.draw.polygon(image, (*WHITE, 100), highlight_points)
+    return image
+
+def draw_collectible(base_size):
+    """Draws the collectible circle with glow and highlight."""
+    image = pg.Surface((base_size, base_size), pg.SRCALPHA)
+    center = base_size // 2
+    radius = base_size // 2 - 2
+
+    # Outer glow
+    for r in range(radius + 4, radius - 1, -1):
+        alpha = int(100 * (1 - (r - radius) / 4))
+        pg.draw.circle(image, (*GREEN, alpha), (center, center), r)
+
+    # Main circle with gradient
+    for r in range(radius, 0, -1):
+        alpha = int(255 * (1 - r / radius * 0.3))
+        pg.draw.circle(image, (*GREEN, alpha), (center, center), r)
+
+    # Highlight
+    highlight_pos = (center - radius//3, center - radius//3)
+    pg.draw.circle(image, (*WHITE, 150), highlight_pos, radius//4)
+    return image
+
+def draw_obstacle(base_size):
+    """Draws the obstacle square with glow, highlight and outline."""
+    image = pg.Surface((base_size, base_size), pg.SRCALPHA)
+    rect = image.get_rect()
+
+    # Outer glow
+    for r in range(3, 0, -1):
+        alpha = int(100 * (1 - r / 3))
+        pg.draw.rect(image, (*RED, alpha), rect.inflate(r*2, r*2), border_radius=3)
+
+    # Main shape with gradient
+    for y in range(base_size):
+        alpha = int(255 * (1 - y / base_size * 0.3))
+        pg.draw.line(image, (*RED, alpha), (0, y), (base_size, y))
+
+    # Add highlight
+    highlight_rect = pg.Rect(0, 0, base_size//2, base_size//2)
+    highlight_rect.topleft = (base_size//4, base_size//4)
+    pg.draw.rect(image, (*WHITE, 100), highlight_rect, border_radius=2)
+
+    # Outline
+    pg.draw.rect(image, (*BLACK, 180), rect, 2, border_radius=3)
+    return image
+
+def draw_looks(scale=1.0):
+    """Draws every sprite look at `scale`, keyed by the name Assets serves it under."""
+    looks = {}
+    looks["player"] = draw_player((round(PLAYER_BASE * scale), round(PLAYER_HEIGHT * scale)), BLUE)
+    looks["obstacle"] = draw_obstacle(round(ITEM_SIZE_OBSTACLE * scale))
+
+    collectible_size = round(ITEM_SIZE_COLLECTIBLE * scale)
+    collectible = draw_collectible(collectible_size)
+    looks["collectible"] = collectible
+    # Pulse frames, so Item.update never rescales at runtime
+    for size in pulse_sizes(collectible_size):
+        looks[f"collectible@{size}"] = pg.transform.scale(collectible, (size, size))
+    return looks
+
+# --- Packing ---
+
+def pack(looks):
+    """Shelf-packs `looks` into one surface. Returns (atlas_surface, {name: (x, y, w, h)})."""
+    order = sorted(looks, key=lambda name: (-looks[name].get_height(), name))
+    index = {}
+    x = y = shelf_height = 0
+    width = 0
+    for name in order:
+        w, h = looks[name].get_size()
+        if x > 0 and x + w > ATLAS_MAX_WIDTH:
+            x = 0
+            y += shelf_height + ATLAS_PADDING
+            shelf_height = 0
+        index[name] = (x, y, w, h)
+        x += w + ATLAS_PADDING
+        width = max(width, x)
+        shelf_height = max(shelf_height, h)
+
+    atlas = pg.Surface((max(1, width), max(1, y + shelf_height)), pg.SRCALPHA)
+    for name, (x, y, w, h) in index.items():
+        atlas.blit(looks[name], (x, y))
+    return atlas, index
+
+def build_atlas(resolution):
+    """Draws and packs the atlas for `resolution` in memory."""
+    scale = resolution[1] / SCREEN_HEIGHT
+    return pack(draw_looks(scale))
+
+def bake_atlas(resolution):
+    """Writes the atlas image and JSON index for `resolution` to IMG_DIR."""
+    atlas, index = build_atlas(resolution)
+    image_path, index_path = atlas_paths(resolution)
+    os.makedirs(IMG_DIR, exist_ok=True)
+    pg.image.save(atlas, image_path)
+    with open(index_path, 'w') as f:
+        json.dump({"resolution": list(resolution), "image": os.path.basename(image_path),
+                   "sprites": {name: list(rect) for name, rect in sorted(index.items())}}, f, indent=4)
+    print(f"Baked {len(index)} sprites into {image_path} ({atlas.get_width()}x{atlas.get_height()}).")
+
+def load_atlas(resolution):
+    """Loads the baked atlas for `resolution`. Returns (atlas_surface, index) or None."""
+    image_path, index_path = atlas_paths(resolution)
+    try:
+        with open(index_path, 'r') as f:
+            data = json.load(f)
+        atlas = pg.image.load(image_path)
+        index = {name: tuple(rect) for name, rect in data["sprites"].items()}
+        return atlas, index
+    except (IOError, pg.error, json.JSONDecodeError, KeyError, TypeError) as e:
+        print(f"Warning: Could not load sprite atlas for {resolution[0]}x{resolution[1]} ({e}).")
+        return None
+
+if __name__ == '__main__':
+    resolutions = [tuple(int(v) for v in arg.lower().split("x")) for arg in sys.argv[1:]]
+    for resolution in resolutions or [(SCREEN_WIDTH, SCREEN_HEIGHT)]:
+        bake_atlas(resolution)
@@ -0,0 +1,121 @@
+# audio.py
+
+import random
+import time
+from array import array
+import pygame as pg
+# --- Use non-relative import for flat structure ---
+from settings import *
+
+DEFAULT_ENTRY = ("ui", 0, (1.0,), (1.0,)) # For sounds missing from SOUND_BANK
+
+def resample(raw, channels, factor):
+    """Plays 16-bit samples `factor` times faster (raising the pitch), with linear interpolation."""
+    samples = array('h')
+    samples.frombytes(raw)
+    frames = len(samples) // channels
+    out_frames = max(1, int(frames / factor))
+    out = array('h', bytes(2 * out_frames * channels))
+    last = frames - 1
+    for i in range(out_frames):
+        position = i * factor
+        index = int(position)
+        if index >= last: index, fraction = last, 0.0
+        else: fraction = position - index
+        a = index * channels
+        b = min(index + 1, last) * channels
+        for c in range(channels):
+            out[i * channels + c] = int(samples[a + c] + (samples[b + c] - samples[a + c]) * fraction)
+    return out.tobytes()
+
+class Voice:
+    __slots__ = ("channel", "priority", "started")
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.priority = 0
+        self.started = 0.0
+
+class AudioEngine:
+    """Plays sounds on mixer channels reserved per category.
+
+    Each sound has a category, a priority and a set of pitch/volume variants
+    decoded when it loads. When all of a category's channels are busy, the
+    lowest-priority (then oldest) voice is stolen, as long as it is not more
+    important than the new sound. A sound played again within
+    SOUND_RATE_LIMIT seconds is skipped. play() never waits or loads
+    anything, so it can be called for every collect.
+    """
+    def __init__(self, bank=SOUND_BANK, categories=AUDIO_CATEGORIES, rate_limit=SOUND_RATE_LIMIT):
+        self.bank = bank
+        self.categories = categories
+        self.rate_limit = rate_limit
+        self.variants = {} # name -> tuple of Sounds; replaced whole once loading is done
+        self.voices = {} # category -> list of Voices
+        self.last_played = {} # name -> time
+        self.rng = random.Random()
+        self.played = 0
+        self.limited = 0
+        self.stolen = 0
+        self.dropped = 0
+
+    def load(self, sounds):
+        """Reserves channels and decodes variants of `sounds` ({name: Sound}). Run on the loader thread."""
+        frequency, size, channels = pg.mixer.get_init()
+        total = sum(self.categories.values())
+        pg.mixer.set_num_channels(max(total, pg.mixer.get_num_channels()))
+        pg.mixer.set_reserved(total) # Keep Sound.play() elsewhere off our channels
+        voices, first = {}, 0
+        for category, count in self.categories.items():
+            voices[category] = [Voice(pg.mixer.Channel(first + i)) for i in range(count)]
+            first += count
+
+        variants = {}
+        for name, sound in sounds.items():
+            _, _, pitches, volumes = self.bank.get(name, DEFAULT_ENTRY)
+            raw = sound.get_raw() if size == -16 and any(p != 1.0 for p in pitches) else None
+            if raw is None: pitches = (1.0,) # Only signed 16-bit samples are resampled
+            decoded = []
+            for pitch in pitches:
+                base = sound if pitch == 1.0 else pg.mixer.Sound(buffer=resample(raw, channels, pitch))
+                for volume in volumes:
+                    variant = base if len(volumes) == 1 else pg.mixer.Sound(buffer=base.get_raw())
+                    variant.set_volume(volume)
+                    decoded.append(variant)
+            variants[name] = tuple(decoded)
+        self.voices = voices
+        self.variants = variants # Published last, so play() never sees a half-built bank
+
+    def play(self, name):
+        variants = self.variants.get(name)
+        if not variants: return
+        now = time.perf_counter()
+        if now - self.last_played.get(name, -1.0) < self.rate_limit:
+            self.limited += 1
+            return
+        category, priority, _, _ = self.bank.get(name, DEFAULT_ENTRY)
+        voices = self.voices.get(category)
+        if not voices: return
+
+        voice = None
+        for candidate in voices:
+            if not candidate.channel.get_busy():
+                voice = candidate
+                break
+        if voice is None:
+            victim = min(voices, key=lambda v: (v.priority, v.started))
+            if victim.priority > priority:
+                self.dropped += 1 # Everything playing matters more
+                return
+            voice = victim
+            self.stolen += 1
+
+        voice.channel.play(variants[self.rng.randrange(len(variants))])
+        voice.priority = priority
+        voice.started = now
+        self.last_played[name] = now
+        self.played += 1
+
+    def stop(self):
+        for voices in self.voices.values():
+            for voice in voices: voice.channel.stop()
@@ -0,0 +1,66 @@
+# bot.py
+
+import random
+# --- Use non-relative import for flat structure ---
+from settings import *
+
+class AutoplayBot:
+    """Plays the game for soak tests: dodges obstacles and chases collectibles.
+
+    Plugs into Player as its input source. Each tick it considers a row of
+    target x positions, works out where the player would be while each
+    falling item passes its height if it ran to that target, and heads for
+    the target that avoids obstacles and picks up the most collectibles.
+    """
+    def __init__(self, game, lookahead=BOT_LOOKAHEAD, jump_chance=BOT_JUMP_CHANCE, seed=None):
+        self.game = game
+        self.lookahead = lookahead
+        self.jump_chance = jump_chance
+        self.rng = random.Random(seed)
+        self.threatened = False
+        self.targets = range(0, SCREEN_WIDTH + 1, BOT_TARGET_STEP)
+
+    def _x_range(self, start_x, target_x, t0, t1, move_speed):
+        """Player x extent between times t0 and t1 while running from start_x to target_x."""
+        step = move_speed if target_x >= start_x else -move_speed
+        reach_time = abs(target_x - start_x) / move_speed
+        x0 = target_x if t0 >= reach_time else start_x + step * t0
+        x1 = target_x if t1 >= reach_time else start_x + step * t1
+        return (x0, x1) if x0 <= x1 else (x1, x0)
+
+    def get_move_direction(self, player):
+        fall_speed = max(1.0, self.game.item_speed * FPS) # Pixels per second
+        move_speed = PLAYER_SPEED * FPS
+        half_width = player.rect.width / 2
+        player_x = player.pos.x
+
+        # Items that reach the player's height within the lookahead, as (enter, exit, x, reach, is_obstacle)
+        incoming = []
+        for item in self.game.items_group:
+            t_exit = (player.rect.bottom - item.rect.top) / fall_speed
+            t_enter = (player.rect.top - item.rect.bottom) / fall_speed
+            if t_exit < 0 or t_enter > self.lookahead: continue
+            reach = half_width + item.rect.width / 2
+            incoming.append((max(0.0, t_enter), t_exit, item.rect.centerx, reach, item.type == 'obstacle'))
+
+        best_target, best_cost = player_x, None
+        for target in self.targets:
+            target_x = min(SCREEN_WIDTH - half_width, max(half_width, target))
+            cost = abs(target_x - player_x) * 0.001 + abs(target_x - SCREEN_WIDTH / 2) * 0.0005
+            for t_enter, t_exit, item_x, reach, is_obstacle in incoming:
+                low, high = self._x_range(player_x, target_x, t_enter, t_exit, move_speed)
+                if is_obstacle:
+                    if low - BOT_SAFETY_MARGIN < item_x + reach and high + BOT_SAFETY_MARGIN > item_x - reach:
+                        cost += 100.0 / (t_enter + 0.1)
+                elif low < item_x + reach and high > item_x - reach:
+                    cost -= 1.0 / (t_enter + 0.5)
+            if best_cost is None or cost < best_cost:
+                best_target, best_cost = target_x, cost
+
+        self.threatened = best_cost is not None and best_cost > 50.0
+        if abs(best_target - player_x) < PLAYER_SPEED / 2: return 0
+        return 1 if best_target > player_x else -1
+
+    def wants_jump(self, player):
+        # Occasional jumps with nothing close keep the jump path exercised
+        return not self.threatened and self.rng.random() < self.jump_chance
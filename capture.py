@@ -0,0 +1,145 @@
+# capture.py
+#
+# Gameplay capture for highlights. After each presented game frame the
+# recorder copies the screen into one of a few preallocated surfaces and
+# queues it for a writer thread; when every surface is still in use the
+# frame is dropped rather than making the game loop wait. The writer keeps
+# the last HIGHLIGHT_SECONDS as compressed frames, and save_highlight()
+# exports them in the background: piped to ffmpeg when it is installed,
+# otherwise as PNG files or one raw RGB file.
+
+import json
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+import zlib
+from collections import deque
+import pygame as pg
+# --- Use non-relative import for flat structure ---
+from settings import *
+
+class CaptureRecorder:
+    def __init__(self, enabled=CAPTURE_MODE, fps=CAPTURE_FPS, scale=CAPTURE_SCALE, pool_size=CAPTURE_POOL_SIZE,
+                 seconds=HIGHLIGHT_SECONDS, output_format=CAPTURE_FORMAT):
+        self.enabled = enabled
+        self.interval = 1.0 / fps
+        self.fps = fps
+        self.scale = scale
+        self.pool_size = pool_size
+        self.output_format = output_format
+        self.size = None # Capture size, even for video encoders; set on the first frame
+        self.staging = None # Full-size copy of the screen, when frames are scaled down
+        self.free = queue.Queue() # Pool surfaces the game loop may fill
+        self.pending = queue.Queue() # Filled surfaces and commands for the writer
+        self.frames = deque(maxlen=max(1, int(seconds * fps))) # Compressed RGB frames; writer thread only
+        self.next_capture = 0.0
+        self.captured = 0
+        self.dropped = 0
+        self.exports = []
+        self.writer = None
+        self.format_check = None # Assets.check_format, set by Game, for SURFACE_FORMAT_DEBUG
+
+    def _start(self, frame_size):
+        width = max(2, int(frame_size[0] * self.scale) // 2 * 2)
+        height = max(2, int(frame_size[1] * self.scale) // 2 * 2)
+        self.size = (width, height)
+        self.staging = pg.Surface(frame_size).convert()
+        for _ in range(self.pool_size):
+            self.free.put(pg.Surface(self.size).convert())
+        self.writer = threading.Thread(target=self._write_frames, daemon=True)
+        self.writer.start()
+
+    def grab(self, renderer):
+        """Call right after a game frame is presented. Copies it into a free pool surface, or drops it."""
+        if not self.enabled: return
+        now = time.perf_counter()
+        if now + 0.004 < self.next_capture: return # A few ms early still counts, so frame jitter doesn't halve the rate
+        self.next_capture += self.interval
+        if self.next_capture <= now: self.next_capture = now + self.interval
+        if self.writer is None: self._start(renderer.get_size())
+        try:
+            surface = self.free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1 # Writer is behind: drop the frame, don't stall the game
+            return
+        renderer.read_pixels(self.staging)
+        if self.format_check: self.format_check(self.staging, "capture staging")
+        if self.staging.get_size() == self.size: surface.blit(self.staging, (0, 0))
+        else: pg.transform.scale(self.staging, self.size, surface)
+        self.pending.put_nowait(surface)
+        self.captured += 1
+
+    def clear(self):
+        """Forgets captured frames, e.g. when a new game starts."""
+        if self.writer: self.pending.put_nowait(("clear", None))
+
+    def save_highlight(self, path):
+        """Exports the buffered frames to `path` (no extension) in the background."""
+        if self.writer: self.pending.put_nowait(("save", path))
+
+    def close(self, timeout=10.0):
+        """Stops the writer and waits for running exports, so highlights aren't cut short on quit."""
+        if self.writer:
+            self.pending.put_nowait(("stop", None))
+            self.writer.join(timeout)
+        for export in self.exports: export.join(timeout)
+        if self.enabled and self.captured:
+            print(f"Capture: {self.captured} frames captured, {self.dropped} dropped.")
+
+    # --- Writer thread ---
+
+    def _write_frames(self):
+        while True:
+            item = self.pending.get()
+            if isinstance(item, tuple):
+                command, path = item
+                if command == "stop": return
+                if command == "clear": self.frames.clear()
+                elif command == "save" and self.frames:
+                    export = threading.Thread(target=self._export, args=(list(self.frames), path), daemon=True)
+                    export.start()
+                    self.exports = [e for e in self.exports if e.is_alive()] + [export]
+                continue
+            pixels = pg.image.tobytes(item, "RGB")
+            self.free.put_nowait(item) # Back to the pool as soon as its pixels are copied
+            self.frames.append(zlib.compress(pixels, 1))
+
+    def _export(self, frames, path):
+        start = time.perf_counter()
+        output_format = self.output_format
+        encoder = shutil.which("ffmpeg")
+        if output_format == "auto": output_format = "ffmpeg" if encoder else "png"
+        if output_format == "ffmpeg" and not encoder:
+            print("Warning: ffmpeg not found. Saving highlight as PNG frames.")
+            output_format = "png"
+        directory = os.path.dirname(path)
+        try:
+            if directory: os.makedirs(directory, exist_ok=True)
+            if output_format == "ffmpeg":
+                target = path + ".mp4"
+                width, height = self.size
+                command = [encoder, "-loglevel", "error", "-y", "-f", "rawvideo", "-pix_fmt", "rgb24",
+                           "-s", f"{width}x{height}", "-r", str(self.fps), "-i", "-", "-pix_fmt", "yuv420p", target]
+                process = subprocess.Popen(command, stdin=subprocess.PIPE)
+                for frame in frames: process.stdin.write(zlib.decompress(frame))
+                process.stdin.close()
+                if process.wait() != 0: raise OSError(f"ffmpeg exited with status {process.returncode}")
+            elif output_format == "raw":
+                target = path + ".rgb"
+                with open(target, 'wb') as f:
+                    for frame in frames: f.write(zlib.decompress(frame))
+                with open(path + ".json", 'w') as f:
+                    json.dump({"width": self.size[0], "height": self.size[1], "fps": self.fps,
+                               "pixel_format": "rgb24", "frames": len(frames)}, f, indent=4)
+            else:
+                target = path
+                os.makedirs(target, exist_ok=True)
+                for index, frame in enumerate(frames):
+                    image = pg.image.frombuffer(zlib.decompress(frame), self.size, "RGB")
+                    pg.image.save(image, os.path.join(target, f"frame_{index:05d}.png"))
+            print(f"Highlight saved to {target} ({len(frames)} frames, {time.perf_counter() - start:.1f}s).")
+        except (OSError, pg.error) as e:
+            print(f"Error saving highlight to {path}: {e}")
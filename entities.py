@@ -0,0 +1,88 @@
+# entities.py
+#
+# Lightweight replacement for pg.sprite.Sprite/Group. Entities are __slots__
+# objects; kill() only sets a flag and bumps a global counter, and every
+# list drops its dead entities the next time it is used, in one pass, only
+# if something died since its last sweep. EntityList keeps the Group calls
+# the rest of the code uses (add, empty, update, draw, sprites, len, iter),
+# and RenderList keeps every entity of the frame in one flat, layer-sorted
+# list drawn with a single Surface.blits call.
+
+deaths = 0 # Bumped by every kill(), so lists know when to sweep. Kept off the class: assigning
+           # to a class attribute would invalidate the interpreter's attribute caches for every entity type
+
+class Entity:
+    """Base for anything drawn in the game: an image at a rect, on a layer."""
+    __slots__ = ("image", "rect", "blit_rect", "dead")
+    layer = 0 # Higher layers are drawn on top
+
+    def __init__(self):
+        self.blit_rect = None # Where the image is drawn, when that isn't rect (the hitbox)
+        self.dead = False
+
+    def kill(self):
+        """Removes the entity from every list, as of their next use."""
+        global deaths
+        self.dead = True
+        deaths += 1
+
+    def alive(self):
+        return not self.dead
+
+    def update(self, *args, **kwargs):
+        pass
+
+class EntityList:
+    """Entities of one kind, with the pg.sprite.Group calls the game uses."""
+    __slots__ = ("entities", "swept")
+
+    def __init__(self, *entities):
+        self.entities = []
+        self.swept = deaths
+        self.add(*entities)
+
+    def sweep(self):
+        if self.swept != deaths:
+            self.entities = [e for e in self.entities if not e.dead]
+            self.swept = deaths
+        return self.entities
+
+    def add(self, *entities):
+        self.entities.extend(e for e in entities if not e.dead)
+
+    def empty(self):
+        self.entities = []
+
+    def sprites(self):
+        return list(self.sweep())
+
+    def update(self, *args, **kwargs):
+        for entity in self.sweep(): entity.update(*args, **kwargs) # Kills are safe (they only set a flag); adds during update are not
+
+    def draw(self, surface):
+        entities = self.sweep()
+        if entities: surface.blits([(e.image, e.rect if e.blit_rect is None else e.blit_rect) for e in entities], False)
+
+    def __iter__(self):
+        return iter(self.sweep())
+
+    def __len__(self):
+        return len(self.sweep())
+
+    def __bool__(self):
+        return bool(self.sweep())
+
+    def __contains__(self, entity):
+        return not entity.dead and entity in self.entities
+
+class RenderList(EntityList):
+    """Every entity of a frame in one flat list, sorted by layer (in insertion order within a layer)."""
+    __slots__ = ()
+
+    def add(self, *entities):
+        items = self.entities
+        for entity in entities:
+            if entity.dead: continue
+            index = len(items)
+            while index and items[index - 1].layer > entity.layer: index -= 1 # Usually appends straight away
+            items.insert(index, entity)
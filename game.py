@@ -3,39 +3,66 @@
 import pygame as pg
 import random
 import math
+import os
+import time
 # --- Use non-relative imports for flat structure ---
 from settings import *
 from sprites import Player, Item, Particle # Removed PowerUp
-from ui import (add_score_popup, draw_hud, draw_pause_screen,
-                update_and_draw_popups, clear_popups)
+from entities import EntityList, RenderList
+from spawner import SpawnScheduler, load_waves
+from latency import LatencyTracer, FramePacer
+from snapshot import SnapshotRing
+from metrics import MetricsRecorder
+from render import SoftwareBackend
+from capture import CaptureRecorder
+from memdiag import MemoryDiagnostics
+from quality import QualityGovernor
+from inputs import InputQueue
+from ui import draw_hud, draw_pause_screen, ScorePopups
 vec = pg.math.Vector2
 
 class Game:
     def __init__(self, screen, clock, assets, persistence):
         self.screen = screen
+        self.renderer = SoftwareBackend(screen) # MainApp swaps in its own backend
         self.clock = clock
         self.assets = assets
         self.persistence = persistence
-        self.player_group = pg.sprite.GroupSingle()
-        self.items_group = pg.sprite.Group()
-        self.particles_group = pg.sprite.Group()
-        self.all_sprites = pg.sprite.Group()
+        self.player_group = EntityList()
+        self.items_group = EntityList()
+        self.particles_group = EntityList()
+        self.all_sprites = RenderList() # Draw order for every entity, by layer
         self.player = None
+        self.input_source = None # Drives the player; None means the keyboard
         self.score = 0
         self.item_speed = BLOCK_SPEED_START
-        self.item_spawn_rate = ITEM_SPAWN_BASE_RATE
-        self.collectible_probability = COLLECTIBLE_PROBABILITY_BASE
-        self.last_item_spawn_time = 0
+        self.spawner = SpawnScheduler(load_waves())
         self.paused = False
         self.game_over = False
         self.shake_timer = 0.0
         self.shake_intensity = SCREEN_SHAKE_INTENSITY
         self.shake_offset = vec(0, 0)
         self.game_stats = { "score": 0, "game_near_misses": 0 }
+        self.sim_time = 0.0 # Seconds of unpaused simulation since reset
+        self.popups = ScorePopups(assets)
+        self.input = InputQueue() # MainApp installs its event filter once the display is up
+        self.latency = LatencyTracer()
+        self.pacer = FramePacer(clock)
+        self.history = SnapshotRing()
+        self.practice_mode = PRACTICE_MODE
+        self.rewinds = 0
+        self.games_played = 0
+        self.metrics = MetricsRecorder()
+        self.capture = CaptureRecorder()
+        self.capture.format_check = assets.check_format
+        self.memory = MemoryDiagnostics(self)
+        self.quality = QualityGovernor()
+        self.quality.add_listener(lambda tier: self.renderer.set_render_scale(tier["render_scale"]))
+        for source in (self.metrics_counters, persistence.metrics_counters, assets.metrics_counters, self.quality.metrics_counters,
+                       self.input.metrics_counters):
+            self.metrics.add_source(source)
 
-    def _spawn_item(self):
-        x_pos = random.randint(ITEM_SIZE_OBSTACLE // 2, SCREEN_WIDTH - ITEM_SIZE_OBSTACLE // 2)
-        itype = 'collectible' if random.random() < self.collectible_probability else 'obstacle'
+    def _spawn_item(self, x_pos, itype):
         item = Item(x_pos, itype, self.assets)
         self.all_sprites.add(item)
         self.items_group.add(item)
@@ -55,13 +82,16 @@ class Game:
         else: self.shake_offset = vec(0, 0)
 
     def _spawn_particles(self, pos, count, color):
-        for _ in range(count):
+        shown = round(count * self.quality.tier["particles"])
+        for i in range(count):
+            # Random values are drawn for every particle, shown or not, so the random sequence doesn't depend on the quality tier
             angle = random.uniform(0, 2 * math.pi)
             speed = random.uniform(1, 4)
             vel = vec(math.cos(angle), math.sin(angle)) * speed
             size = random.uniform(2, 5)
             lifetime = random.uniform(0.3, 0.7)
-            p = Particle(pos, vel, size, color, lifetime)
+            if i >= shown: continue
+            p = Particle(pos, vel, size, color, lifetime, self.assets)
             self.all_sprites.add(p)
             self.particles_group.add(p)
 
@@ -70,102 +100,161 @@ class Game:
         self.player_group.empty()
         self.items_group.empty()
         self.particles_group.empty()
-        clear_popups()
-        self.player = Player(self.assets)
+        self.popups.clear()
+        self.popups.get_frames("+1", YELLOW) # Warm the common popup
+        self.player = Player(self.assets, self.input_source)
         self.all_sprites.add(self.player)
         self.player_group.add(self.player)
         self.score = 0
         self.item_speed = BLOCK_SPEED_START
-        self.last_item_spawn_time = pg.time.get_ticks()
+        self.spawner.reset(random.getrandbits(32))
         self.paused = False
         self.game_over = False
         self.shake_timer = 0.0
         self.shake_offset = vec(0, 0)
         self.game_stats = { key: 0 for key in self.game_stats }
+        self.sim_time = 0.0
+        self.history.clear()
+        self.rewinds = 0
+        self.capture.clear()
         self.assets.update_background(BG_COLOR_DARK_START, BG_COLOR_LIGHT_START) # Reset BG
+        self.memory.checkpoint()
+
+    def handle_input(self, timed):
+        """Handles one TimedInput. Returns "quit" or "menu" when it ends the game loop."""
+        event = timed.event
+        if event.type in (pg.QUIT, pg.WINDOWCLOSE): return "quit"
+        if event.type == pg.KEYDOWN:
+            if event.key == pg.K_ESCAPE or event.key == pg.K_p:
+                self.latency.input("pause", timed)
+                self.paused = not self.paused
+            if not self.paused:
+                if (event.key == pg.K_UP or event.key == pg.K_SPACE) and self.player:
+                    self.latency.input("jump", timed)
+                    self.player.jump()
+                elif event.key == pg.K_LEFT or event.key == pg.K_RIGHT: self.latency.input("move", timed)
+            else: # Pause keys
+                 if event.key == pg.K_m: return "menu"
+                 if event.key == pg.K_q: return "quit"
+        return None
+
+    def step(self, dt):
+        """Advances the simulation by dt seconds. Returns False once the player has been hit."""
+        # Updates
+        self.sim_time += dt
+        self.item_speed = min(MAX_ITEM_SPEED, BLOCK_SPEED_START + self.score * SPEED_INCREMENT_PER_SCORE)
+        if self.player and self.player.input_source.wants_jump(self.player): self.player.jump()
+        if self.player: self.player.update(dt)
+        pulse = self.quality.tier["pulse"]
+        for item in self.items_group: item.update(dt, self.item_speed, pulse)
+        self.particles_group.update(dt)
+        self._update_shake(dt)
+
+        # Spawn items
+        event = self.spawner.pop_due(self.sim_time)
+        while event:
+            self._spawn_item(event[1], event[2])
+            event = self.spawner.pop_due(self.sim_time)
+
+        # Collisions
+        if self.player:
+            player_rect = self.player.rect
+            items_hit = [item for item in self.items_group if player_rect.colliderect(item.rect)]
+            for item in items_hit: item.kill() # All at once, as groupcollide did
+            for item in items_hit:
+                if item.type == 'obstacle':
+                    self.assets.play_sound("hit")
+                    if self.practice_mode and self.history.rewind(self, PRACTICE_REWIND_SECONDS):
+                        self.rewinds += 1
+                        self.player.flash(RED, PLAYER_HIT_FLASH_DURATION)
+                        self._start_shake(0.3, 8)
+                        return True
+                    self._start_shake(0.3, 8)
+                    self.player.flash(RED, PLAYER_HIT_FLASH_DURATION)
+                    self.game_over = True
+                    self.games_played += 1
+                    self.persistence.increment_stat("games_played")
+                    self.persistence.increment_stat("total_score", self.score)
+                    self.game_stats["score"] = self.score
+                    if self.score > self.persistence.get_highscore():
+                        self.capture.save_highlight(os.path.join(CAPTURE_DIR, time.strftime("highlight_%Y%m%d_%H%M%S")))
+                    self.persistence.save_data()
+                    return False
+                elif item.type == 'collectible':
+                    score_increase = 1
+                    crossed_milestone = ( (self.score + score_increase) // SCORE_MILESTONE > self.score // SCORE_MILESTONE )
+                    self.score += score_increase
+                    self.persistence.increment_stat("total_collectibles")
+                    self.assets.play_sound("collect")
+                    self.popups.add(item.rect.center, f"+{score_increase}", YELLOW, self.sim_time)
+                    self._spawn_particles(item.rect.center, 5, GREEN)
+                    if crossed_milestone and self.score > 0: self._start_shake(0.1, 3)
+            # Removed powerup collisions
+            # Removed near miss
+        self.history.capture(self)
+        return True
+
+    def metrics_counters(self):
+        return {
+            "game_games_played_total": self.games_played,
+            "game_score": self.score,
+            "game_sprites": len(self.all_sprites),
+            "game_rewinds_total": self.rewinds,
+        }
 
     def run(self):
-        running = True
-        while running:
-            dt = self.clock.tick(FPS) / 1000.0
-            if dt > 0.1: dt = 0.1
-
-            # Event Handling
-            for event in pg.event.get():
-                if event.type == pg.QUIT: return "quit", self.score
-                if event.type == pg.KEYDOWN:
-                    if event.key == pg.K_ESCAPE or event.key == pg.K_p: self.paused = not self.paused
-                    if not self.paused:
-                        if (event.key == pg.K_UP or event.key == pg.K_SPACE) and self.player: self.player.jump()
-                    else: # Pause keys
-                         if event.key == pg.K_m: return "menu", self.score
-                         if event.key == pg.K_q: return "quit", self.score
+        while True:
+            dt = self.pacer.wait()
+            self.quality.begin_frame()
+
+            # Input: everything queued since the last tick, oldest first
+            self.input.poll()
+            timed = self.input.pop()
+            while timed:
+                result = self.handle_input(timed)
+                if result: return result, self.score
+                timed = self.input.pop()
 
             if self.paused:
-                # Draw Pause Screen
-                self.assets.draw_background(self.screen)
-                for sprite in self.all_sprites: self.screen.blit(sprite.image, sprite.rect.topleft)
-                current_high_score = self.persistence.get_highscore()
-                draw_hud(self.screen, self.score, current_high_score, 0, None, self.assets)
-                draw_pause_screen(self.screen, self.assets)
-                pg.display.flip()
+                self.draw_paused()
+                self.quality.skip_frame()
+                self.metrics.frame(dt)
+                self.memory.tick()
                 continue
 
-            # Updates
-            self.item_speed = min(MAX_ITEM_SPEED, BLOCK_SPEED_START + self.score * SPEED_INCREMENT_PER_SCORE)
-            self.player_group.update(dt)
-            for item in self.items_group: item.update(dt, self.item_speed)
-            self.particles_group.update(dt)
-            self._update_shake(dt)
-
-            # Spawn items
-            now = pg.time.get_ticks()
-            spawn_interval_ms = (1000.0 / FPS) * self.item_spawn_rate
-            if now - self.last_item_spawn_time > spawn_interval_ms:
-                 self._spawn_item()
-                 self.last_item_spawn_time = now
-
-            # Collisions
-            if self.player:
-                collided_items_dict = pg.sprite.groupcollide(self.player_group, self.items_group, False, True, pg.sprite.collide_rect)
-                for player_collision_instance, items_hit in collided_items_dict.items():
-                    for item in items_hit:
-                        if item.type == 'obstacle':
-                            self.assets.play_sound("hit")
-                            self._start_shake(0.3, 8)
-                            player_collision_instance.flash(RED, PLAYER_HIT_FLASH_DURATION)
-                            self.game_over = True
-                            running = False
-                            self.persistence.increment_stat("games_played")
-                            self.persistence.increment_stat("total_score", self.score)
-                            self.game_stats["score"] = self.score
-                            self.persistence.save_data()
-                            break
-                        elif item.type == 'collectible':
-                            score_increase = 1
-                            crossed_milestone = ( (self.score + score_increase) // SCORE_MILESTONE > self.score // SCORE_MILESTONE )
-                            self.score += score_increase
-                            self.persistence.increment_stat("total_collectibles")
-                            self.assets.play_sound("collect")
-                            add_score_popup(item.rect.center, f"+{score_increase}", YELLOW, self.assets)
-                            self._spawn_particles(item.rect.center, 5, GREEN)
-                            if crossed_milestone and self.score > 0: self._start_shake(0.1, 3)
-                    if not running: break
-                # Removed powerup collisions
-                # Removed near miss
-
-            if not running: continue
+            if not self.step(dt): break
             self.draw()
+            self.quality.end_frame()
+            self.metrics.frame(dt)
+            self.memory.tick()
 
         final_state = "gameover" if self.game_over else "menu"
         return final_state, self.score
 
+    def draw_paused(self):
+        target = self.assets.debug_target(self.renderer.begin_frame())
+        translucent = self.quality.tier["overlays"]
+        if translucent: # Covered by a solid overlay otherwise
+            self.assets.draw_background(target)
+            self.all_sprites.draw(target)
+            current_high_score = self.persistence.get_highscore()
+            draw_hud(target, self.score, current_high_score, 0, None, self.assets)
+        draw_pause_screen(target, self.assets, translucent)
+        self.renderer.present()
+        self.latency.presented()
+        self.pacer.presented()
+
     def draw(self):
-        temp_surface = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        self.assets.draw_background(temp_surface)
-        self.all_sprites.draw(temp_surface)
+        tier = self.quality.tier
+        target = self.assets.debug_target(self.renderer.begin_frame(self.shake_offset if tier["shake"] else (0, 0)))
+        self.assets.draw_background(target)
+        if SURFACE_FORMAT_DEBUG:
+            for sprite in self.all_sprites: self.assets.check_format(sprite.image, type(sprite).__name__)
+        self.all_sprites.draw(target)
         current_high_score = self.persistence.get_highscore()
-        draw_hud(temp_surface, self.score, current_high_score, 0, None, self.assets)
-        update_and_draw_popups(temp_surface, self.clock.get_time()/1000.0)
-        self.screen.blit(temp_surface, self.shake_offset)
-        pg.display.flip()
\ No newline at end of file
+        draw_hud(target, self.score, current_high_score, 0, None, self.assets)
+        self.popups.draw(target, self.sim_time, tier["popup_fade"])
+        self.renderer.present()
+        self.capture.grab(self.renderer)
+        self.latency.presented()
+        self.pacer.presented()
\ No newline at end of file
@@ -0,0 +1,81 @@
+# inputs.py
+#
+# Input layer between SDL's event queue and the game. install() lets only
+# INPUT_EVENTS onto the SDL queue, so mouse motion, window and text events
+# are dropped by SDL instead of being queued and skipped every frame. poll()
+# moves whatever is queued into a deque, stamping each event with the time
+# it was read and the time of the previous poll (the earliest it can have
+# arrived; pygame events carry no timestamp). Consumers pop from that deque
+# in the simulation tick. deque appends and pops are atomic, so one other
+# thread can push() synthetic inputs without a lock. Only the deque is
+# lock-free: the counters each have a single writer, and drops are worked
+# out on the main thread from them instead of being counted as they happen.
+
+import time
+from collections import deque
+import pygame as pg
+# --- Use non-relative import for flat structure ---
+from settings import *
+
+class TimedInput:
+    __slots__ = ("event", "time", "earliest")
+
+    def __init__(self, event, read_time, earliest):
+        self.event = event
+        self.time = read_time # perf_counter() when read off the SDL queue (or pushed)
+        self.earliest = earliest # Previous poll: the earliest the event can have arrived
+
+class InputQueue:
+    def __init__(self, allowed=INPUT_EVENTS, capacity=INPUT_QUEUE_SIZE):
+        self.allowed = allowed
+        self.queue = deque(maxlen=capacity) # The oldest inputs are dropped if nothing consumes them
+        self.last_poll = None
+        self.read = 0 # Main thread only
+        self.consumed = 0 # Main thread only
+        self.pushed = 0 # Written only by the pushing thread
+        self.dropped = 0
+
+    def install(self):
+        """Restricts the SDL queue to the allowed event types. Call after the display is set up."""
+        pg.event.set_blocked(None)
+        pg.event.set_allowed(list(self.allowed))
+
+    def poll(self):
+        """Moves events from the SDL queue (main thread only) into the queue, timestamped."""
+        now = time.perf_counter()
+        earliest = self.last_poll if self.last_poll is not None else now
+        for event in pg.event.get():
+            self.queue.append(TimedInput(event, now, earliest))
+            self.read += 1
+        self.last_poll = now
+
+    def push(self, event):
+        """Queues an event from another thread (one at a time), e.g. an external controller."""
+        now = time.perf_counter()
+        self.queue.append(TimedInput(event, now, now))
+        self.pushed += 1 # After the append, so a drop is at worst counted late, never early
+
+    def pop(self):
+        """Oldest queued input, or None. Main thread only."""
+        try:
+            timed = self.queue.popleft()
+        except IndexError:
+            return None
+        self.consumed += 1
+        return timed
+
+    def clear(self):
+        while self.pop() is not None: pass # Popped one by one, so pushes racing the clear aren't counted as drops
+
+    def count_dropped(self):
+        """Inputs pushed out of the full queue so far. Main thread only."""
+        dropped = self.read + self.pushed - self.consumed - len(self.queue)
+        self.dropped = max(self.dropped, dropped) # Stays monotonic while a push is half done
+        return self.dropped
+
+    def metrics_counters(self):
+        self.count_dropped()
+        return {
+            "game_input_events_total": self.read,
+            "game_input_dropped_total": self.dropped,
+        }
@@ -0,0 +1,110 @@
+# latency.py
+
+import time
+# --- Use non-relative import for flat structure ---
+from settings import *
+
+class LatencyTracer:
+    """Measures input latency from reading an input event to the flip of the frame that shows it.
+
+    Per input kind it keeps two 1 ms histograms: "read" runs from the moment
+    the event is taken off the SDL queue, "bound" from the previous queue poll,
+    which is the earliest the event could have arrived (SDL events carry no
+    arrival time in pygame). Both times come from the InputQueue's stamps.
+    The real input-to-photon latency lies between them.
+    """
+    BUCKET_MS = 1
+    BUCKETS = 100 # Last bucket collects everything slower
+
+    def __init__(self, enabled=LATENCY_TRACE):
+        self.enabled = enabled
+        self.pending = [] # (kind, read_time, earliest_arrival)
+        self.histograms = {} # kind -> read-to-flip bucket counts
+        self.bound_histograms = {} # kind -> previous-poll-to-flip bucket counts
+
+    def input(self, kind, timed):
+        """Records a handled input; `timed` is its TimedInput from the InputQueue."""
+        if not self.enabled: return
+        self.pending.append((kind, timed.time, timed.earliest))
+
+    def presented(self):
+        """Call right after pg.display.flip(); closes every pending input."""
+        if not self.enabled or not self.pending: return
+        now = time.perf_counter()
+        for kind, read_time, earliest in self.pending:
+            self._add(self.histograms, kind, now - read_time)
+            self._add(self.bound_histograms, kind, now - earliest)
+        self.pending.clear()
+
+    def _add(self, histograms, kind, seconds):
+        counts = histograms.get(kind)
+        if counts is None:
+            counts = histograms[kind] = [0] * (self.BUCKETS + 1)
+        counts[min(self.BUCKETS, int(seconds * 1000.0 / self.BUCKET_MS))] += 1
+
+    @classmethod
+    def percentile(cls, counts, q):
+        """Upper edge in ms of the bucket holding quantile `q`."""
+        total = sum(counts)
+        if not total: return 0.0
+        running = 0
+        for bucket, count in enumerate(counts):
+            running += count
+            if running >= q * total:
+                return (bucket + 1) * cls.BUCKET_MS
+        return len(counts) * cls.BUCKET_MS
+
+    def report(self):
+        if not self.enabled or not self.histograms: return
+        print("Input latency (ms, read -> flip | previous poll -> flip):")
+        for kind in sorted(self.histograms):
+            counts, bounds = self.histograms[kind], self.bound_histograms[kind]
+            print(f"  {kind:<6} n={sum(counts):<5} "
+                  f"p50={self.percentile(counts, 0.5):>3} p95={self.percentile(counts, 0.95):>3} p99={self.percentile(counts, 0.99):>3} | "
+                  f"p50={self.percentile(bounds, 0.5):>3} p95={self.percentile(bounds, 0.95):>3} p99={self.percentile(bounds, 0.99):>3}")
+            buckets = ", ".join(f"{b * self.BUCKET_MS}-{(b + 1) * self.BUCKET_MS}:{c}" for b, c in enumerate(counts) if c)
+            print(f"         histogram {buckets}")
+
+class FramePacer:
+    """Paces the game loop at FPS and returns each frame's dt.
+
+    Normally this is just Clock.tick. In low-latency mode frames are laid on
+    a fixed grid of present deadlines, and input is sampled as late as the
+    estimated frame work allows, instead of right after the previous flip.
+    That shortens input-to-flip time whenever a frame needs less than the
+    full frame interval, which is most of the time.
+    """
+    def __init__(self, clock, low_latency=LOW_LATENCY_MODE, fps=FPS):
+        self.clock = clock
+        self.low_latency = low_latency
+        self.interval = 1.0 / fps
+        self.work_estimate = self.interval / 4
+        self.sample_time = None
+        self.deadline = None
+
+    def wait(self):
+        """Waits until input should be sampled. Returns dt in seconds, capped at 0.1."""
+        if not self.low_latency:
+            return min(0.1, self.clock.tick(FPS) / 1000.0)
+
+        if self.deadline is not None:
+            target = self.deadline - self.work_estimate - LOW_LATENCY_MARGIN
+            remaining = target - time.perf_counter()
+            if remaining > 0.002: time.sleep(remaining - 0.002) # Sleep coarsely, then spin
+            while time.perf_counter() < target: pass
+        now = time.perf_counter()
+        dt = now - self.sample_time if self.sample_time is not None else self.interval
+        self.sample_time = now
+        self.clock.tick() # Keeps Clock.get_fps() meaningful
+        return min(0.1, dt)
+
+    def presented(self):
+        """Call right after pg.display.flip()."""
+        if not self.low_latency or self.sample_time is None: return
+        now = time.perf_counter()
+        work = now - self.sample_time
+        # Rise at once on slow frames, decay slowly, so deadlines are rarely missed
+        self.work_estimate = work if work > self.work_estimate else self.work_estimate * 0.98 + work * 0.02
+        if self.deadline is None or now > self.deadline + self.interval:
+            self.deadline = now # Fell behind: start a new grid
+        self.deadline += self.interval
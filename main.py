@@ -7,21 +7,33 @@ import os
 from settings import *
 from assets import Assets
 from persistence import Persistence
-from ui import (draw_main_menu, draw_game_over, draw_pause_screen, draw_transition)
+from ui import (draw_main_menu, draw_game_over, draw_pause_screen, TransitionRenderer)
 from game import Game
+from profiler import PhaseTimer
+from metrics import MetricsExporter
+from render import SoftwareBackend, HardwareBackend
 
 class MainApp:
     def __init__(self):
-        pg.init()
+        self.startup_timer = PhaseTimer("Startup")
+        # Only the modules needed for the first frame; the mixer starts on the sound loader thread
+        pg.display.init()
+        pg.font.init()
+        self.startup_timer.mark("pygame init")
 
         # Initial window setup from persistence
         self.persistence = Persistence() # Init persistence first
         self.fullscreen = self.persistence.is_fullscreen() # Load saved preference
+        self.startup_timer.mark("persistence")
         self.current_flags = FULLSCREEN_FLAGS if self.fullscreen else WINDOW_FLAGS
         resolution = (0,0) if self.fullscreen else (SCREEN_WIDTH, SCREEN_HEIGHT)
 
+        self.renderer = None
+        if RENDER_BACKEND == "hardware":
+            self.renderer = HardwareBackend.create((SCREEN_WIDTH, SCREEN_HEIGHT), TITLE, self.fullscreen)
         try:
-            self.screen = pg.display.set_mode(resolution, self.current_flags)
+            if self.renderer: self.screen = pg.display.get_surface() # Hidden; only used for pixel formats
+            else: self.screen = pg.display.set_mode(resolution, self.current_flags)
         except pg.error as e:
             print(f"Error setting initial display mode: {e}. Trying default windowed.")
             self.fullscreen = False
@@ -35,6 +47,8 @@ class MainApp:
                  sys.exit()
 
         pg.display.set_caption(TITLE)
+        if self.renderer is None: self.renderer = SoftwareBackend(self.screen)
+        self.startup_timer.mark("display")
         self.clock = pg.time.Clock()
         self.running = True
         self.current_state = STATE_MENU
@@ -42,6 +56,10 @@ class MainApp:
         # Init other components
         self.assets = Assets()
         self.game = Game(self.screen, self.clock, self.assets, self.persistence)
+        self.game.renderer = self.renderer
+        self.game.input.install()
+        self.transitions = TransitionRenderer(self.assets)
+        self.exporter = MetricsExporter(self.game.metrics).start() if METRICS_EXPORT else None
 
         # State transition variables
         self.transitioning = False
@@ -52,14 +70,13 @@ class MainApp:
         self.game_over_is_new_hs = False
 
         # Load assets and apply settings
-        self.assets.load()
-        self.assets.sounds_enabled = self.persistence.is_sound_enabled()
-        if not self.assets.sounds_enabled:
-            if pg.mixer.get_init(): pg.mixer.stop()
+        self.assets.load(self.persistence.is_sound_enabled())
+        self.startup_timer.mark("assets")
 
     def _toggle_fullscreen(self):
         self.fullscreen = not self.fullscreen
         self.persistence.set_fullscreen(self.fullscreen)
+        if self.renderer.set_fullscreen(self.fullscreen): return
 
         if self.fullscreen:
             try:
@@ -77,6 +94,8 @@ class MainApp:
         try:
             self.screen = pg.display.set_mode(resolution, self.current_flags)
             self.game.screen = self.screen # Update game's screen ref
+            self.renderer.on_display_changed(self.screen)
+            self.assets.on_display_changed()
         except pg.error as e:
             print(f"Error toggling fullscreen: {e}. Reverting.")
             self.fullscreen = not self.fullscreen # Revert state
@@ -87,6 +106,8 @@ class MainApp:
             try:
                  self.screen = pg.display.set_mode(resolution, self.current_flags)
                  self.game.screen = self.screen
+                 self.renderer.on_display_changed(self.screen)
+                 self.assets.on_display_changed()
             except pg.error as e2:
                  print(f"FATAL ERROR: Could not reset display mode: {e2}")
                  self.running = False # Quit
@@ -97,6 +118,11 @@ class MainApp:
             self.transition_progress = 0.0
             self.previous_state_for_draw = self.current_state
             self.next_state = next_state
+            if self.transitions.kind == "crossfade":
+                # Blend from a snapshot of the current screen, skipping the fade-out half
+                self.transitions.capture(self.renderer)
+                self.current_state = STATE_TRANSITION_OUT
+                self.transition_progress = 1.0
 
     def _update_transition(self, dt):
         if not self.transitioning: return
@@ -126,23 +152,36 @@ class MainApp:
             if not self.running: break
             self.update(delta_time)
             self.draw()
+            self.game.metrics.frame(delta_time)
+            if self.startup_timer:
+                self.startup_timer.mark("first frame")
+                self.startup_timer.report()
+                self.startup_timer = None
         self.quit()
 
     def events(self):
-        for event in pg.event.get():
-            if event.type == pg.QUIT: self.running = False; return
-            if event.type == pg.VIDEORESIZE and not self.fullscreen: pass # Ignore for SCALED mode
-            if event.type == pg.KEYDOWN:
-                if event.key == pg.K_q:
-                    if self.current_state in [STATE_MENU, STATE_GAMEOVER, STATE_PAUSED]:
-                        self.running = False; return
-                if event.key == FULLSCREEN_TOGGLE_KEY: self._toggle_fullscreen()
-                if not self.transitioning:
-                    if self.current_state == STATE_MENU:
-                        if event.key == pg.K_RETURN: self._start_transition(STATE_GAME)
-                    elif self.current_state == STATE_GAMEOVER:
-                        if event.key == pg.K_r: self._start_transition(STATE_GAME)
-                        elif event.key == pg.K_m: self._start_transition(STATE_MENU)
+        self.game.input.poll()
+        timed = self.game.input.pop()
+        while timed:
+            self.handle_input(timed)
+            if not self.running: return
+            timed = self.game.input.pop()
+
+    def handle_input(self, timed):
+        event = timed.event
+        if event.type in (pg.QUIT, pg.WINDOWCLOSE): self.running = False; return
+        if event.type == pg.KEYDOWN:
+            self.game.latency.input("menu", timed)
+            if event.key == pg.K_q:
+                if self.current_state in [STATE_MENU, STATE_GAMEOVER, STATE_PAUSED]:
+                    self.running = False; return
+            if event.key == FULLSCREEN_TOGGLE_KEY: self._toggle_fullscreen()
+            if not self.transitioning:
+                if self.current_state == STATE_MENU:
+                    if event.key == pg.K_RETURN: self._start_transition(STATE_GAME)
+                elif self.current_state == STATE_GAMEOVER:
+                    if event.key == pg.K_r: self._start_transition(STATE_GAME)
+                    elif event.key == pg.K_m: self._start_transition(STATE_MENU)
 
     def update(self, dt):
         if self.transitioning: self._update_transition(dt)
@@ -153,25 +192,33 @@ class MainApp:
             if self.current_state == STATE_TRANSITION_OUT: state_to_draw = self.previous_state_for_draw
             elif self.current_state == STATE_TRANSITION_IN: state_to_draw = self.next_state
 
-        if state_to_draw == STATE_MENU: draw_main_menu(self.screen, self.persistence.get_highscore(), self.assets)
-        elif state_to_draw == STATE_GAME:
-            if not self.transitioning:
-                game_result, score = self.game.run()
-                self.last_score = score
-                if game_result == "quit": self.running = False
-                elif game_result == "menu": self._start_transition(STATE_MENU)
-                elif game_result == "gameover": self._start_transition(STATE_GAMEOVER)
-            else: self.assets.draw_background(self.screen)
-        elif state_to_draw == STATE_GAMEOVER: draw_game_over(self.screen, self.last_score, self.persistence.get_highscore(), self.game_over_is_new_hs, self.assets)
+        if state_to_draw == STATE_GAME and not self.transitioning:
+            # The game loop draws and presents its own frames
+            game_result, score = self.game.run()
+            self.last_score = score
+            if game_result == "quit": self.running = False
+            elif game_result == "menu": self._start_transition(STATE_MENU)
+            elif game_result == "gameover": self._start_transition(STATE_GAMEOVER)
+            return
+
+        target = self.assets.debug_target(self.renderer.begin_frame())
+        if state_to_draw == STATE_MENU: draw_main_menu(target, self.persistence.get_highscore(), self.assets)
+        elif state_to_draw == STATE_GAME: self.assets.draw_background(target)
+        elif state_to_draw == STATE_GAMEOVER: draw_game_over(target, self.last_score, self.persistence.get_highscore(), self.game_over_is_new_hs, self.assets, self.game.quality.tier["overlays"])
         elif state_to_draw == STATE_PAUSED: pass # Handled in game loop
 
         if self.transitioning:
             fade_direction = "in" if self.current_state == STATE_TRANSITION_IN else "out"
-            draw_transition(self.screen, fade_direction, self.transition_progress)
+            self.transitions.draw(target, fade_direction, self.transition_progress)
 
-        pg.display.flip()
+        self.renderer.present()
+        self.game.latency.presented()
 
     def quit(self):
+        self.game.latency.report()
+        if self.exporter: self.exporter.stop()
+        self.game.capture.close()
+        self.game.memory.report()
         try:
             self.persistence.save_data()
         except Exception as e:
@@ -192,5 +239,5 @@ if __name__ == '__main__':
         import traceback
         traceback.print_exc()
         print("------------------------------------\n")
-        if pg.get_init(): pg.quit()
+        if pg.display.get_init(): pg.quit()
         input("--- Press Enter to exit ---")
\ No newline at end of file
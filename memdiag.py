@@ -0,0 +1,137 @@
+# memdiag.py
+#
+# Memory diagnostics for long sessions (MEMORY_DIAGNOSTICS). Counts sprites,
+# popups and Assets surfaces periodically, and at every Game.reset also
+# counts live sprite objects and diffs a tracemalloc snapshot against the
+# previous reset. Sprites that outlive their game, and numbers that keep
+# growing from one game to the next, are flagged in the report written on exit.
+
+import gc
+import time
+import tracemalloc
+from collections import Counter, deque
+# --- Use non-relative import for flat structure ---
+from settings import *
+from profiler import current_rss_bytes
+from entities import Entity
+import ui
+
+MB = 1024 * 1024
+EXPECTED_AFTER_RESET = {"live_Player": 1, "live_Item": 0, "live_Particle": 0}
+GROWTH_RESETS = 4 # Consecutive growing resets before a number is reported as growing
+KEPT_DIFFS = 5 # Resets whose allocation diffs are kept for the report
+
+class MemoryDiagnostics:
+    def __init__(self, game, enabled=MEMORY_DIAGNOSTICS, report_path=MEMORY_REPORT_FILE,
+                 interval=MEMORY_SAMPLE_INTERVAL, top=MEMORY_TOP_STATS):
+        self.game = game
+        self.enabled = enabled
+        self.report_path = report_path
+        self.interval = interval
+        self.top = top
+        self.start_time = time.perf_counter()
+        self.next_sample = self.start_time + interval
+        self.samples = deque(maxlen=200) # (elapsed s, counts) taken every interval
+        self.checkpoints = [] # (reset number, elapsed s, counts) taken right after each reset
+        self.diffs = deque(maxlen=KEPT_DIFFS) # (reset number, [formatted tracemalloc stats])
+        self.previous_snapshot = None
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start(MEMORY_TRACE_FRAMES)
+
+    def counts(self, live_objects=False):
+        game = self.game
+        surfaces, surface_bytes = game.assets.surface_stats()
+        traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+        counts = {
+            "rss_mb": round(current_rss_bytes() / MB, 1),
+            "traced_mb": round(traced / MB, 2),
+            "all_sprites": len(game.all_sprites),
+            "items_group": len(game.items_group),
+            "particles_group": len(game.particles_group),
+            "popups_live": game.popups.live,
+            "popup_glyphs": len(game.popups.glyph_cache),
+            "text_cache": len(ui.text_cache),
+            "surfaces": surfaces,
+            "surface_mb": round(surface_bytes / MB, 2),
+        }
+        if live_objects:
+            # Entities that exist at all, killed or not. A full heap walk, so only done at resets.
+            gc.collect()
+            live = Counter(type(o).__name__ for o in gc.get_objects() if isinstance(o, Entity))
+            for name in ("Player", "Item", "Particle"): counts["live_" + name] = live.get(name, 0)
+        return counts
+
+    def tick(self):
+        """Call once per frame; samples counts every MEMORY_SAMPLE_INTERVAL seconds."""
+        if not self.enabled: return
+        now = time.perf_counter()
+        if now < self.next_sample: return
+        self.next_sample = now + self.interval
+        self.samples.append((now - self.start_time, self.counts()))
+
+    def checkpoint(self):
+        """Call at the end of Game.reset: records counts and the allocation growth since the previous reset."""
+        if not self.enabled: return
+        number = len(self.checkpoints)
+        self.checkpoints.append((number, time.perf_counter() - self.start_time, self.counts(live_objects=True)))
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__), # Our own sample history
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        if self.previous_snapshot is not None:
+            stats = snapshot.compare_to(self.previous_snapshot, "lineno")
+            self.diffs.append((number, [str(stat) for stat in stats if stat.size_diff > 0][:self.top]))
+        self.previous_snapshot = snapshot
+
+    def suspects(self):
+        """Plain-language findings: objects alive after a reset, and numbers growing at every reset."""
+        found = []
+        if not self.checkpoints: return found
+        number, _, last = self.checkpoints[-1]
+        for key, expected in EXPECTED_AFTER_RESET.items():
+            if last.get(key, expected) > expected:
+                found.append(f"{last[key]} {key[5:]} objects alive after reset {number} (expected {expected}); "
+                             f"something still references sprites from the previous game")
+        history = [counts for _, _, counts in self.checkpoints[1:]] # The first reset happens before any game
+        if len(history) >= GROWTH_RESETS:
+            recent = history[-GROWTH_RESETS:]
+            for key in recent[0]:
+                values = [counts[key] for counts in recent]
+                if all(b > a for a, b in zip(values, values[1:])):
+                    found.append(f"{key} grew at each of the last {GROWTH_RESETS} resets: {' -> '.join(str(v) for v in values)}")
+        return found
+
+    def report(self):
+        """Writes the report to MEMORY_REPORT_FILE and prints any suspects."""
+        if not self.enabled: return
+        self.samples.append((time.perf_counter() - self.start_time, self.counts()))
+        lines = [f"Memory diagnostics, {time.strftime('%Y-%m-%d %H:%M:%S')}, "
+                 f"{len(self.checkpoints)} resets in {(time.perf_counter() - self.start_time) / 60.0:.1f} min", ""]
+
+        def table(title, rows):
+            if not rows: return
+            columns = list(rows[0][2].keys())
+            lines.append(title)
+            lines.append("  ".join(["reset", "elapsed_s"] + columns))
+            for number, elapsed, counts in rows:
+                lines.append("  ".join([str(number), f"{elapsed:.0f}"] + [str(counts.get(c, "")) for c in columns]))
+            lines.append("")
+
+        table("After each reset:", self.checkpoints)
+        table(f"Every {self.interval:.0f}s:", [("-", elapsed, counts) for elapsed, counts in self.samples])
+        for number, stats in self.diffs:
+            lines.append(f"Allocation growth between resets {number - 1} and {number}:")
+            lines.extend("  " + stat for stat in stats or ["(none)"])
+            lines.append("")
+        suspects = self.suspects()
+        lines.append("Suspects:")
+        lines.extend("  " + finding for finding in suspects or ["(none)"])
+
+        try:
+            with open(self.report_path, 'w') as f:
+                f.write("\n".join(lines) + "\n")
+            print(f"Memory report written to {self.report_path}.")
+        except IOError as e:
+            print(f"Error writing memory report: {e}")
+        for finding in suspects: print(f"Memory: {finding}")
@@ -0,0 +1,199 @@
+# metrics.py
+#
+# Optional metrics export for unattended machines. The game loop records
+# frame times into a MetricsRecorder and, once per METRICS_PUBLISH_INTERVAL,
+# publishes an immutable snapshot by swapping a single reference. A
+# MetricsExporter thread picks snapshots up, aggregates them and serves
+# Prometheus text on http://METRICS_HOST:METRICS_PORT/metrics or rewrites
+# METRICS_FILE. Neither side ever waits on the other.
+
+import os
+import threading
+import time
+from array import array
+from http.server import HTTPServer, BaseHTTPRequestHandler
+# --- Use non-relative import for flat structure ---
+from settings import *
+from profiler import current_rss_bytes
+
+# name -> (Prometheus type, help). Counters from sources not listed here are exported as gauges.
+METRICS = {
+    "game_games_played_total": ("counter", "Games finished since start"),
+    "game_score": ("gauge", "Score of the current game"),
+    "game_sprites": ("gauge", "Live sprites"),
+    "game_rewinds_total": ("counter", "Practice-mode rewinds"),
+    "game_persistence_saves_total": ("counter", "Successful saves of the game data file"),
+    "game_persistence_save_failures_total": ("counter", "Failed saves of the game data file"),
+    "game_assets_sounds_loaded": ("gauge", "Sounds loaded"),
+    "game_assets_load_failures_total": ("counter", "Sounds or images that failed to load"),
+    "game_assets_cached_surfaces": ("gauge", "Surfaces held in the asset caches"),
+    "game_assets_format_warnings": ("gauge", "Surfaces found in a non-display pixel format"),
+    "game_audio_sounds_played_total": ("counter", "Sounds started"),
+    "game_audio_voices_stolen_total": ("counter", "Sounds cut off to play a more important one"),
+    "game_audio_sounds_dropped_total": ("counter", "Sounds skipped by the rate limit or because every voice was busy"),
+    "game_input_events_total": ("counter", "Input events read off the SDL queue"),
+    "game_input_dropped_total": ("counter", "Inputs dropped because the input queue was full"),
+    "game_quality_level": ("gauge", "Visual quality tier, 0 is the best"),
+    "game_quality_changes_total": ("counter", "Quality tier changes made by the governor"),
+}
+QUANTILES = (0.5, 0.95, 0.99)
+
+class MetricsSnapshot:
+    """What the game loop hands to the exporter. Never modified after it is published."""
+    __slots__ = ("time", "span", "frames", "frame_times", "counters")
+
+    def __init__(self, time, span, frames, frame_times, counters):
+        self.time = time
+        self.span = span # Seconds covered by frame_times
+        self.frames = frames # Frames since start
+        self.frame_times = frame_times # Frame times (s) since the previous snapshot
+        self.counters = counters
+
+class MetricsRecorder:
+    """Game-loop side: records frame times and periodically publishes a MetricsSnapshot."""
+    def __init__(self, enabled=METRICS_EXPORT is not None, interval=METRICS_PUBLISH_INTERVAL, capacity=METRICS_WINDOW):
+        self.enabled = enabled
+        self.interval = interval
+        self.sources = [] # Callables returning {metric name: value}, called on the game thread
+        self.frame_times = array('d', bytes(8 * capacity))
+        self.count = 0
+        self.frames = 0
+        self.last_publish = None
+        self.latest = None
+
+    def add_source(self, source):
+        self.sources.append(source)
+
+    def frame(self, seconds):
+        """Call once per presented frame."""
+        if not self.enabled: return
+        if self.count < len(self.frame_times):
+            self.frame_times[self.count] = seconds
+            self.count += 1
+        self.frames += 1
+        now = time.perf_counter()
+        if self.last_publish is None: self.last_publish = now
+        elif now - self.last_publish >= self.interval: self.publish(now)
+
+    def publish(self, now=None):
+        now = time.perf_counter() if now is None else now
+        counters = {}
+        for source in self.sources: counters.update(source())
+        span = now - self.last_publish if self.last_publish is not None else 0.0
+        # A single reference assignment, so the exporter sees either the old snapshot or the new one
+        self.latest = MetricsSnapshot(now, span, self.frames, self.frame_times[:self.count], counters)
+        self.count = 0
+        self.last_publish = now
+
+class MetricsExporter:
+    """Background side: aggregates snapshots from a MetricsRecorder and exports them."""
+    def __init__(self, recorder, mode=METRICS_EXPORT, host=METRICS_HOST, port=METRICS_PORT,
+                 path=METRICS_FILE, window=METRICS_WINDOW):
+        self.recorder = recorder
+        self.mode = mode
+        self.address = (host, port)
+        self.path = path
+        self.window = array('d', bytes(8 * window)) # Recent frame times, for quantiles
+        self.window_index = 0
+        self.window_count = 0
+        self.frame_time_sum = 0.0
+        self.frame_time_count = 0
+        self.seen = None
+        self.page = "" # Latest rendered text, replaced whole
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.http = None
+
+    def start(self):
+        if self.mode == "http":
+            exporter = self
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path not in ("/", "/metrics"):
+                        self.send_error(404)
+                        return
+                    body = exporter.page.encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                def log_message(self, format, *args): pass # Keep the console quiet
+            try:
+                self.http = HTTPServer(self.address, Handler)
+            except OSError as e:
+                print(f"Warning: Could not serve metrics on {self.address[0]}:{self.address[1]} ({e}). Metrics export disabled.")
+                return self
+            threading.Thread(target=self.http.serve_forever, daemon=True).start()
+            print(f"Serving metrics on http://{self.address[0]}:{self.address[1]}/metrics")
+        elif self.mode != "file":
+            print(f"Warning: Unknown METRICS_EXPORT mode '{self.mode}'. Metrics export disabled.")
+            return self
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread: self.thread.join(1.0)
+        if self.http:
+            self.http.shutdown()
+            self.http.server_close()
+
+    def _run(self):
+        # Poll twice per publish interval so no snapshot is missed
+        while not self.stop_event.wait(self.recorder.interval / 2):
+            self.collect()
+
+    def collect(self):
+        """Takes the newest snapshot, if there is one we haven't seen, and re-exports."""
+        snapshot = self.recorder.latest
+        if snapshot is None or snapshot is self.seen: return
+        self.seen = snapshot
+        window = self.window
+        for seconds in snapshot.frame_times:
+            window[self.window_index] = seconds
+            self.window_index = (self.window_index + 1) % len(window)
+            self.frame_time_sum += seconds
+        self.window_count = min(len(window), self.window_count + len(snapshot.frame_times))
+        self.frame_time_count += len(snapshot.frame_times)
+        self.page = self.render(snapshot)
+        if self.mode == "file": self._write_file()
+
+    def render(self, snapshot):
+        fps = len(snapshot.frame_times) / snapshot.span if snapshot.span > 0 else 0.0
+        samples = sorted(self.window[:self.window_count])
+        lines = [
+            "# HELP game_frames_total Frames presented since start",
+            "# TYPE game_frames_total counter",
+            f"game_frames_total {snapshot.frames}",
+            "# HELP game_fps Frames per second over the last publish interval",
+            "# TYPE game_fps gauge",
+            f"game_fps {fps:.2f}",
+            "# HELP game_frame_time_seconds Frame times over the recent window",
+            "# TYPE game_frame_time_seconds summary",
+        ]
+        for q in QUANTILES:
+            value = samples[min(len(samples) - 1, int(q * len(samples)))] if samples else 0.0
+            lines.append(f'game_frame_time_seconds{{quantile="{q}"}} {value:.6f}')
+        lines.append(f"game_frame_time_seconds_sum {self.frame_time_sum:.6f}")
+        lines.append(f"game_frame_time_seconds_count {self.frame_time_count}")
+        lines.append("# HELP game_resident_memory_bytes Resident set size of the process")
+        lines.append("# TYPE game_resident_memory_bytes gauge")
+        lines.append(f"game_resident_memory_bytes {current_rss_bytes()}")
+        for name, value in sorted(snapshot.counters.items()):
+            kind, description = METRICS.get(name, ("gauge", name))
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def _write_file(self):
+        # Write aside and rename, so readers never see a half-written file
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                f.write(self.page)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Warning: Could not write metrics file '{self.path}': {e}")
@@ -0,0 +1,205 @@
+# netclient.py
+#
+# Client for network play. Predicts its own player locally at the server's
+# tick rate and reconciles with each authoritative state; everything else is
+# drawn as the server last reported it.
+#
+#     python netclient.py --host 127.0.0.1 --match friday --mode coop
+
+import argparse
+import socket
+import time
+import pygame as pg
+# --- Use non-relative import for flat structure ---
+from settings import *
+from netsim import SimPlayer, MODE_VERSUS, MODE_COOP
+import protocol
+
+HELLO_RETRY = 0.5 # Seconds between HELLOs while waiting for a WELCOME
+
+class NetClient:
+    """Non-blocking UDP connection to a match, polled once per frame."""
+    def __init__(self, host, port=NET_PORT, mode=MODE_VERSUS, match_name=""):
+        self.server = (host, port)
+        self.mode = mode
+        self.match_name = match_name
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+        self.player_id = None
+        self.match_id = None
+        self.tick_rate = NET_TICK_RATE
+        self.last_hello = None
+        # Prediction
+        self.predicted = None # SimPlayer for the local player
+        self.seq = 0
+        self.pending = [] # (seq, direction, jump) not yet applied by the server
+        # Latest authoritative state
+        self.baselines = {} # tick -> items, for decoding deltas
+        self.state_tick = protocol.NO_BASELINE
+        self.flags = 0
+        self.players = {} # player_id -> SimPlayer as the server reported it
+        self.items = {}
+        self.corrections = 0 # States that disagreed with the prediction
+
+    @property
+    def connected(self):
+        return self.player_id is not None
+
+    def _send(self, data):
+        try:
+            self.sock.sendto(data, self.server)
+        except OSError as e:
+            print(f"Warning: Could not send to {self.server}: {e}")
+
+    def poll(self):
+        """Sends HELLO until welcomed and processes every datagram that has arrived."""
+        now = time.monotonic()
+        if not self.connected and (self.last_hello is None or now - self.last_hello >= HELLO_RETRY):
+            self._send(protocol.encode_hello(self.mode, self.match_name))
+            self.last_hello = now
+        while True:
+            try:
+                data, _ = self.sock.recvfrom(65536)
+            except (BlockingIOError, ConnectionResetError):
+                return
+            try:
+                kind = protocol.message_type(data)
+                if kind == protocol.MSG_WELCOME and not self.connected:
+                    self.player_id, self.tick_rate, self.match_id = protocol.decode_welcome(data)
+                elif kind == protocol.MSG_STATE and self.connected:
+                    self._on_state(protocol.decode_state(data, self.baselines))
+            except protocol.ProtocolError as e:
+                print(f"Warning: Dropped packet from server: {e}")
+
+    def _on_state(self, state):
+        if state is None: return # Encoded against a baseline we no longer have
+        tick, last_seq, flags, players, items = state
+        self.baselines[tick] = items
+        if len(self.baselines) > NET_STATE_HISTORY:
+            for old in sorted(self.baselines)[:-NET_STATE_HISTORY]: del self.baselines[old]
+        if self.state_tick != protocol.NO_BASELINE and tick <= self.state_tick: return # Out of order
+
+        self.state_tick, self.flags, self.items = tick, flags, items
+        for player_id, x, y, vel_y, on_ground, alive, score in players:
+            player = self.players.get(player_id)
+            if player is None: player = self.players[player_id] = SimPlayer(player_id)
+            player.x, player.y, player.vel_y = x, y, vel_y
+            player.on_ground, player.alive, player.score = on_ground, alive, score
+        for player_id in [p for p in self.players if p not in {entry[0] for entry in players}]:
+            del self.players[player_id]
+        self._reconcile(last_seq)
+
+    def _reconcile(self, last_seq):
+        """Restarts the prediction from the server's player and replays the inputs it hasn't seen."""
+        server_player = self.players.get(self.player_id)
+        if server_player is None: return
+        if self.predicted is None: self.predicted = SimPlayer(self.player_id)
+        before = (self.predicted.x, self.predicted.y)
+        self.pending = [entry for entry in self.pending if entry[0] > last_seq]
+        self.predicted.copy_from(server_player)
+        if self.started and not self.over:
+            dt = 1.0 / self.tick_rate
+            for _, direction, jump in self.pending: self.predicted.step(direction, jump, dt)
+        if abs(before[0] - self.predicted.x) > 0.5 or abs(before[1] - self.predicted.y) > 0.5:
+            self.corrections += 1
+
+    def send_input(self, direction, jump):
+        """Records one tick of input, predicts it, and sends every unacknowledged input."""
+        if not self.connected: return
+        if self.predicted is not None and self.started and not self.over:
+            self.seq += 1
+            self.pending.append((self.seq, direction, jump))
+            self.predicted.step(direction, jump, 1.0 / self.tick_rate)
+        self._send(protocol.encode_input(self.state_tick, self.pending))
+
+    @property
+    def started(self):
+        return bool(self.flags & protocol.FLAG_STARTED)
+
+    @property
+    def over(self):
+        return bool(self.flags & protocol.FLAG_OVER)
+
+    def close(self):
+        if self.connected: self._send(protocol.encode_bye())
+        self.sock.close()
+
+class NetPlayApp:
+    """Window for a network match: fixed-tick input and prediction, drawing at the display rate."""
+    def __init__(self, client):
+        from assets import Assets
+        pg.display.init()
+        pg.font.init()
+        self.screen = pg.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), WINDOW_FLAGS)
+        pg.display.set_caption(f"{TITLE} (network)")
+        self.clock = pg.time.Clock()
+        self.assets = Assets()
+        self.assets.load()
+        self.client = client
+        self.jump_requested = False
+        rival = self.assets.get_image("player").copy()
+        rival.fill((*GOLD, 0), special_flags=pg.BLEND_RGB_ADD)
+        self.rival_image = rival
+
+    def run(self):
+        accumulator = 0.0
+        tick = 1.0 / self.client.tick_rate
+        running = True
+        while running:
+            accumulator += min(0.1, self.clock.tick(FPS) / 1000.0)
+            for event in pg.event.get():
+                if event.type == pg.QUIT or (event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE):
+                    running = False
+                elif event.type == pg.KEYDOWN and event.key in (pg.K_SPACE, pg.K_UP, pg.K_w):
+                    self.jump_requested = True
+            self.client.poll()
+            tick = 1.0 / self.client.tick_rate
+            while accumulator >= tick:
+                keys = pg.key.get_pressed()
+                direction = (1 if keys[pg.K_RIGHT] or keys[pg.K_d] else 0) - (1 if keys[pg.K_LEFT] or keys[pg.K_a] else 0)
+                self.client.send_input(direction, self.jump_requested)
+                self.jump_requested = False
+                accumulator -= tick
+            self.draw()
+        self.client.close()
+
+    def draw(self):
+        from ui import draw_text
+        client, assets, screen = self.client, self.assets, self.screen
+        assets.draw_background(screen)
+        for x, y, obstacle in client.items.values():
+            image = assets.get_image("obstacle" if obstacle else "collectible")
+            screen.blit(image, image.get_rect(center=(x, y)))
+        for player_id, player in client.players.items():
+            if not player.alive: continue
+            if player_id == client.player_id:
+                shown, image = client.predicted or player, assets.get_image("player")
+            else:
+                shown, image = player, self.rival_image
+            screen.blit(image, image.get_rect(center=(round(shown.x), round(shown.y))))
+
+        font = assets.font_small
+        if client.mode == MODE_COOP:
+            draw_text(screen, f"TEAM: {sum(p.score for p in client.players.values())}", 28, 20, 30, WHITE, font, align="midleft")
+        else:
+            scores = "  ".join(f"{'YOU' if pid == client.player_id else 'P' + str(pid)}: {p.score}"
+                               for pid, p in sorted(client.players.items()))
+            draw_text(screen, scores, 28, 20, 30, WHITE, font, align="midleft")
+        if not client.connected:
+            draw_text(screen, "Connecting...", 36, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, ACCENT, font)
+        elif not client.started:
+            draw_text(screen, "Waiting for players...", 36, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, ACCENT, font)
+        elif client.over:
+            draw_text(screen, "GAME OVER", 52, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, RED, assets.font_normal)
+        pg.display.flip()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Join a network match.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=NET_PORT)
+    parser.add_argument("--match", default="", help="Match name; players using the same name play together")
+    parser.add_argument("--mode", choices=("versus", "coop"), default="versus")
+    args = parser.parse_args()
+    mode = MODE_COOP if args.mode == "coop" else MODE_VERSUS
+    NetPlayApp(NetClient(args.host, args.port, mode, args.match)).run()
+    pg.quit()
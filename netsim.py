@@ -0,0 +1,126 @@
+# netsim.py
+#
+# Surface-free simulation for networked matches. The server runs it
+# authoritatively, and clients use SimPlayer to predict their own player.
+# Physics mirror Player.update and Item.update in sprites.py.
+
+# --- Use non-relative import for flat structure ---
+from settings import *
+from spawner import SpawnScheduler, load_waves
+
+MODE_VERSUS = 0
+MODE_COOP = 1
+
+class SimPlayer:
+    __slots__ = ("player_id", "x", "y", "vel_y", "on_ground", "alive", "score")
+
+    def __init__(self, player_id, x=PLAYER_START_POS[0]):
+        self.player_id = player_id
+        self.x = float(x)
+        self.y = float(PLAYER_GROUND_Y - PLAYER_HEIGHT / 2) # Centre, standing on the ground
+        self.vel_y = 0.0
+        self.on_ground = True
+        self.alive = True
+        self.score = 0
+
+    def step(self, direction, jump, dt):
+        """Applies one tick of input. Same rules as Player.jump/Player.update."""
+        if not self.alive: return
+        if jump and self.on_ground:
+            self.vel_y = PLAYER_JUMP_POWER
+            self.on_ground = False
+        self.x += direction * PLAYER_SPEED * dt * FPS
+        self.vel_y += PLAYER_GRAVITY * dt * FPS
+        self.y += self.vel_y * dt * FPS
+
+        half_width = PLAYER_BASE / 2
+        half_height = PLAYER_HEIGHT / 2
+        if self.x < half_width: self.x = half_width
+        if self.x > SCREEN_WIDTH - half_width: self.x = SCREEN_WIDTH - half_width
+        if self.y + half_height >= PLAYER_GROUND_Y:
+            self.y = PLAYER_GROUND_Y - half_height
+            self.vel_y = 0.0
+            self.on_ground = True
+        else:
+            self.on_ground = False
+        if self.y - half_height < 0:
+            self.y = half_height
+            self.vel_y = max(0.0, self.vel_y)
+
+    def copy_from(self, other):
+        self.x, self.y, self.vel_y = other.x, other.y, other.vel_y
+        self.on_ground, self.alive, self.score = other.on_ground, other.alive, other.score
+
+class SimItem:
+    __slots__ = ("item_id", "x", "y", "obstacle", "size")
+
+    def __init__(self, item_id, x, y, obstacle):
+        self.item_id = item_id
+        self.x = x
+        self.y = y
+        self.obstacle = obstacle
+        self.size = ITEM_SIZE_OBSTACLE if obstacle else ITEM_SIZE_COLLECTIBLE
+
+class MatchSimulation:
+    """One match: shared falling items and up to NET_MAX_PLAYERS players, stepped at a fixed tick."""
+    def __init__(self, mode=MODE_VERSUS, seed=None, waves=None):
+        self.mode = mode
+        self.players = {} # player_id -> SimPlayer
+        self.items = {} # item_id -> SimItem
+        self.tick = 0
+        self.sim_time = 0.0
+        self.next_item_id = 1
+        self.spawner = SpawnScheduler(waves or load_waves())
+        self.spawner.reset(seed)
+
+    def add_player(self, player_id):
+        spacing = SCREEN_WIDTH / (NET_MAX_PLAYERS + 1)
+        player = SimPlayer(player_id, spacing * (len(self.players) + 1))
+        self.players[player_id] = player
+        return player
+
+    def remove_player(self, player_id):
+        self.players.pop(player_id, None)
+
+    def team_score(self):
+        return sum(player.score for player in self.players.values())
+
+    def is_over(self):
+        return bool(self.players) and not any(player.alive for player in self.players.values())
+
+    def step(self, inputs, dt):
+        """Advances one tick. `inputs` maps player_id -> (direction, jump)."""
+        self.tick += 1
+        self.sim_time += dt
+        for player_id, player in self.players.items():
+            direction, jump = inputs.get(player_id, (0, False))
+            player.step(direction, jump, dt)
+
+        top_score = self.team_score() if self.mode == MODE_COOP else max((p.score for p in self.players.values()), default=0)
+        item_speed = min(MAX_ITEM_SPEED, BLOCK_SPEED_START + top_score * SPEED_INCREMENT_PER_SCORE)
+        removed = set()
+        for item in self.items.values():
+            item.y += item_speed * dt * FPS
+            if item.y - item.size / 2 > SCREEN_HEIGHT + 50: removed.add(item.item_id)
+
+        event = self.spawner.pop_due(self.sim_time)
+        while event:
+            obstacle = event[2] == 'obstacle'
+            size = ITEM_SIZE_OBSTACLE if obstacle else ITEM_SIZE_COLLECTIBLE
+            self.items[self.next_item_id] = SimItem(self.next_item_id, event[1], -(size // 2), obstacle)
+            self.next_item_id += 1
+            event = self.spawner.pop_due(self.sim_time)
+
+        # Collisions (axis-aligned boxes, as pg.sprite.collide_rect)
+        half_width, half_height = PLAYER_BASE / 2, PLAYER_HEIGHT / 2
+        for item in self.items.values():
+            if item.item_id in removed: continue
+            half = item.size / 2
+            for player in self.players.values():
+                if not player.alive: continue
+                if abs(player.x - item.x) < half_width + half and abs(player.y - item.y) < half_height + half:
+                    if item.obstacle: player.alive = False
+                    else: player.score += 1
+                    removed.add(item.item_id)
+                    break
+        for item_id in removed: self.items.pop(item_id, None)
@@ -5,7 +5,10 @@ import os
 from settings import * # Import needed settings
 
 class Persistence:
-    def __init__(self):
+    def __init__(self, path=HIGHSCORE_FILE):
+        self.path = path
+        self.save_count = 0
+        self.save_failures = 0
         self.data = {
             "highscore": 0,
             "sound_enabled": True,
@@ -21,19 +24,19 @@ class Persistence:
             # "achievements": {aid: data['unlocked'] for aid, data in ACHIEVEMENTS.items()} # Removed achievements save
         }
         # Ensure directory exists
-        save_dir = os.path.dirname(HIGHSCORE_FILE)
+        save_dir = os.path.dirname(self.path)
         if save_dir and not os.path.exists(save_dir):
              os.makedirs(save_dir)
         self.load_data()
 
     def load_data(self):
-        if not os.path.exists(HIGHSCORE_FILE):
+        if not os.path.exists(self.path):
             print("No save file found, using defaults.")
             self.save_data() # Create file with defaults
             return
 
         try:
-            with open(HIGHSCORE_FILE, 'r') as f:
+            with open(self.path, 'r') as f:
                 loaded_data = json.load(f)
 
             # Validate and merge loaded data
@@ -57,7 +60,7 @@ class Persistence:
             print(f"Error loading game data: {e}. Using default values.")
             # Reset to defaults if loading fails
             default_fullscreen = self.data["fullscreen"] # Preserve attempt if possible
-            self.__init__() # Re-initialize with defaults
+            self.__init__(self.path) # Re-initialize with defaults
             self.data["fullscreen"] = default_fullscreen # Restore loaded fullscreen if possible
             self.save_data()
 
@@ -66,12 +69,20 @@ class Persistence:
             # Update achievement status before saving - Removed
             # self.data["achievements"] = {aid: data['unlocked'] for aid, data in ACHIEVEMENTS.items()}
 
-            with open(HIGHSCORE_FILE, 'w') as f:
+            with open(self.path, 'w') as f:
                 json.dump(self.data, f, indent=4)
+            self.save_count += 1
             # print("Game data saved.") # Can be noisy
         except IOError as e:
+            self.save_failures += 1
             print(f"Error saving game data: {e}")
 
+    def metrics_counters(self):
+        return {
+            "game_persistence_saves_total": self.save_count,
+            "game_persistence_save_failures_total": self.save_failures,
+        }
+
     def get_highscore(self):
         return self.data["highscore"]
 
@@ -0,0 +1,93 @@
+# profiler.py
+
+import os
+import sys
+import time
+from array import array
+
+class PhaseTimer:
+    """Records how long each named phase (e.g. startup steps) takes."""
+    def __init__(self, label="Startup"):
+        self.label = label
+        self.start_time = time.perf_counter()
+        self.last_time = self.start_time
+        self.phases = []
+
+    def mark(self, name):
+        """Closes the current phase under `name` and starts the next one."""
+        now = time.perf_counter()
+        self.phases.append((name, (now - self.last_time) * 1000.0))
+        self.last_time = now
+
+    def total_ms(self):
+        return (self.last_time - self.start_time) * 1000.0
+
+    def report(self):
+        parts = ", ".join(f"{name} {ms:.1f}ms" for name, ms in self.phases)
+        print(f"{self.label}: {parts} (total {self.total_ms():.1f}ms)")
+
+def current_rss_bytes():
+    """Resident set size of this process, or 0 if it can't be read on this platform."""
+    try:
+        with open("/proc/self/statm", 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (IOError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource # Peak rather than current RSS, but better than nothing
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return 0
+
+class FrameProfiler:
+    """Collects frame times and RSS over long runs and appends summary rows to a CSV report."""
+    COLUMNS = ["elapsed_s", "frames", "fps", "frame_ms_p50", "frame_ms_p95", "frame_ms_p99",
+               "frame_ms_max", "rss_mb", "games", "saves", "sprites", "popups"]
+
+    def __init__(self, report_path=None, interval=10.0, window=4096):
+        self.report_path = report_path
+        self.interval = interval
+        self.frame_times = array('d', bytes(8 * window)) # Ring buffer of recent frame times (s)
+        self.window = window
+        self.frame_index = 0
+        self.frames = 0
+        self.start_time = time.perf_counter()
+        self.last_report_time = self.start_time
+        self.last_report_frames = 0
+        self.last_row = None
+        if report_path:
+            with open(report_path, 'w') as f:
+                f.write(",".join(self.COLUMNS) + "\n")
+
+    def record_frame(self, seconds):
+        self.frame_times[self.frame_index] = seconds
+        self.frame_index = (self.frame_index + 1) % self.window
+        self.frames += 1
+
+    def due(self):
+        return time.perf_counter() - self.last_report_time >= self.interval
+
+    def percentiles(self):
+        samples = sorted(self.frame_times[:min(self.frames, self.window)])
+        if not samples: return 0.0, 0.0, 0.0, 0.0
+        pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] * 1000.0
+        return pick(0.50), pick(0.95), pick(0.99), samples[-1] * 1000.0
+
+    def report(self, games=0, saves=0, sprites=0, popups=0):
+        """Appends one summary row (and prints it). Extra counters come from the caller."""
+        now = time.perf_counter()
+        span = max(1e-9, now - self.last_report_time)
+        fps = (self.frames - self.last_report_frames) / span
+        p50, p95, p99, worst = self.percentiles()
+        row = [round(now - self.start_time, 1), self.frames, round(fps, 1), round(p50, 2), round(p95, 2),
+               round(p99, 2), round(worst, 2), round(current_rss_bytes() / (1024 * 1024), 1),
+               games, saves, sprites, popups]
+        self.last_row = row
+        self.last_report_time = now
+        self.last_report_frames = self.frames
+        print("  ".join(f"{name}={value}" for name, value in zip(self.COLUMNS, row)))
+        if self.report_path:
+            with open(self.report_path, 'a') as f:
+                f.write(",".join(str(value) for value in row) + "\n")
+        return row
@@ -0,0 +1,144 @@
+# protocol.py
+#
+# Binary UDP messages for network play. Every datagram starts with a
+# one-byte message type:
+#
+#   HELLO    client -> server  mode, match name
+#   WELCOME  server -> client  player id, tick rate, match id
+#   INPUT    client -> server  newest state tick received, then the last few
+#                              (seq, direction, jump) inputs, resent until acked
+#   STATE    server -> client  players in full, items delta-compressed against
+#                              the state tick the client last acknowledged
+#   BYE      either way        leave the match
+#
+# Item deltas only carry the change in y, since items never move sideways.
+# Items new since the baseline are sent in full and vanished ones as ids.
+
+import struct
+
+MSG_HELLO = 1
+MSG_WELCOME = 2
+MSG_INPUT = 3
+MSG_STATE = 4
+MSG_BYE = 5
+
+NO_BASELINE = 0xFFFFFFFF
+FLAG_STARTED = 1
+FLAG_OVER = 2
+
+HELLO = struct.Struct("!BB")
+WELCOME = struct.Struct("!BBHI")
+INPUT_HEADER = struct.Struct("!BIB")
+INPUT_ENTRY = struct.Struct("!Ibb")
+STATE_HEADER = struct.Struct("!BIIIBBHHH")
+STATE_PLAYER = struct.Struct("!BfffBH")
+STATE_ITEM = struct.Struct("!IhhB")
+STATE_DELTA = struct.Struct("!Ih")
+STATE_REMOVED = struct.Struct("!I")
+MAX_INPUTS_PER_PACKET = 8
+MAX_NAME_BYTES = 32
+
+class ProtocolError(ValueError):
+    pass
+
+def message_type(data):
+    if not data: raise ProtocolError("empty datagram")
+    return data[0]
+
+def encode_hello(mode, match_name):
+    return HELLO.pack(MSG_HELLO, mode) + match_name.encode("utf-8")[:MAX_NAME_BYTES]
+
+def decode_hello(data):
+    try:
+        _, mode = HELLO.unpack_from(data)
+        return mode, data[HELLO.size:HELLO.size + MAX_NAME_BYTES].decode("utf-8", "replace")
+    except struct.error as e:
+        raise ProtocolError(f"bad HELLO: {e}")
+
+def encode_welcome(player_id, tick_rate, match_id):
+    return WELCOME.pack(MSG_WELCOME, player_id, tick_rate, match_id)
+
+def decode_welcome(data):
+    try:
+        _, player_id, tick_rate, match_id = WELCOME.unpack_from(data)
+        return player_id, tick_rate, match_id
+    except struct.error as e:
+        raise ProtocolError(f"bad WELCOME: {e}")
+
+def encode_input(ack_tick, inputs):
+    """`inputs` is a sequence of (seq, direction, jump), oldest first."""
+    inputs = inputs[-MAX_INPUTS_PER_PACKET:]
+    parts = [INPUT_HEADER.pack(MSG_INPUT, ack_tick, len(inputs))]
+    parts.extend(INPUT_ENTRY.pack(seq, direction, 1 if jump else 0) for seq, direction, jump in inputs)
+    return b"".join(parts)
+
+def decode_input(data):
+    try:
+        _, ack_tick, count = INPUT_HEADER.unpack_from(data)
+        inputs = [INPUT_ENTRY.unpack_from(data, INPUT_HEADER.size + i * INPUT_ENTRY.size) for i in range(count)]
+        return ack_tick, [(seq, direction, bool(jump)) for seq, direction, jump in inputs]
+    except struct.error as e:
+        raise ProtocolError(f"bad INPUT: {e}")
+
+def encode_bye():
+    return bytes((MSG_BYE,))
+
+def encode_state(tick, last_seq, flags, players, items, baseline_tick=NO_BASELINE, baseline_items=None):
+    """`players`: (id, x, y, vel_y, on_ground, alive, score) tuples.
+    `items` / `baseline_items`: {item_id: (x, y, obstacle)} with integer coordinates.
+    """
+    full, deltas, removed = [], [], []
+    if baseline_items is None:
+        baseline_tick = NO_BASELINE
+        full = list(items.items())
+    else:
+        for item_id, item in items.items():
+            base = baseline_items.get(item_id)
+            if base is None: full.append((item_id, item))
+            elif base[1] != item[1]: deltas.append((item_id, item[1] - base[1]))
+        removed = [item_id for item_id in baseline_items if item_id not in items]
+
+    parts = [STATE_HEADER.pack(MSG_STATE, tick, baseline_tick, last_seq, flags,
+                               len(players), len(full), len(deltas), len(removed))]
+    for player_id, x, y, vel_y, on_ground, alive, score in players:
+        parts.append(STATE_PLAYER.pack(player_id, x, y, vel_y, (1 if on_ground else 0) | (2 if alive else 0), min(score, 0xFFFF)))
+    parts.extend(STATE_ITEM.pack(item_id, x, y, 1 if obstacle else 0) for item_id, (x, y, obstacle) in full)
+    parts.extend(STATE_DELTA.pack(item_id, dy) for item_id, dy in deltas)
+    parts.extend(STATE_REMOVED.pack(item_id) for item_id in removed)
+    return b"".join(parts)
+
+def decode_state(data, baselines):
+    """Decodes a STATE message against `baselines` ({tick: items}).
+
+    Returns (tick, last_seq, flags, players, items), or None when the
+    baseline it was encoded against is no longer known.
+    """
+    try:
+        (_, tick, baseline_tick, last_seq, flags,
+         player_count, full_count, delta_count, removed_count) = STATE_HEADER.unpack_from(data)
+        if baseline_tick == NO_BASELINE: items = {}
+        elif baseline_tick in baselines: items = dict(baselines[baseline_tick])
+        else: return None
+
+        offset = STATE_HEADER.size
+        players = []
+        for _ in range(player_count):
+            player_id, x, y, vel_y, player_flags, score = STATE_PLAYER.unpack_from(data, offset)
+            players.append((player_id, x, y, vel_y, bool(player_flags & 1), bool(player_flags & 2), score))
+            offset += STATE_PLAYER.size
+        for _ in range(full_count):
+            item_id, x, y, obstacle = STATE_ITEM.unpack_from(data, offset)
+            items[item_id] = (x, y, bool(obstacle))
+            offset += STATE_ITEM.size
+        for _ in range(delta_count):
+            item_id, dy = STATE_DELTA.unpack_from(data, offset)
+            x, y, obstacle = items[item_id]
+            items[item_id] = (x, y + dy, obstacle)
+            offset += STATE_DELTA.size
+        for _ in range(removed_count):
+            item_id, = STATE_REMOVED.unpack_from(data, offset)
+            items.pop(item_id, None)
+            offset += STATE_REMOVED.size
+        return tick, last_seq, flags, players, items
+    except (struct.error, KeyError) as e:
+        raise ProtocolError(f"bad STATE: {e}")
@@ -0,0 +1,86 @@
+# quality.py
+#
+# Adaptive visual quality. The game loop times the work of each gameplay
+# frame (simulation, drawing and present, not the wait for the next frame)
+# and the governor steps through QUALITY_TIERS: down as soon as a window of
+# frames averages too close to the frame budget, up only after a long
+# stretch with plenty of headroom. A step up that has to be undone right
+# away doubles the wait before the next one, so the tiers don't flap.
+# Tiers only change how things look; the simulation is the same at every tier.
+
+import time
+from collections import deque
+# --- Use non-relative import for flat structure ---
+from settings import *
+
+class QualityGovernor:
+    def __init__(self, enabled=QUALITY_GOVERNOR, tiers=QUALITY_TIERS, budget=1.0 / FPS, window=QUALITY_WINDOW):
+        self.enabled = enabled
+        self.tiers = tiers
+        self.budget = budget
+        self.work_times = deque(maxlen=window)
+        self.work_sum = 0.0
+        self.level = 0 # Index into tiers, 0 is the best
+        self.tier = tiers[0]
+        self.frame_start = None
+        self.headroom_since = None # When frames last started averaging under QUALITY_UP_LOAD
+        self.up_hold = QUALITY_UP_SECONDS
+        self.last_up = None
+        self.changes = 0
+        self.listeners = [] # Called with the new tier after every change
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def begin_frame(self):
+        """Call when a gameplay frame's work starts, right after the frame wait."""
+        self.frame_start = time.perf_counter()
+
+    def skip_frame(self):
+        """Call instead of end_frame for frames that shouldn't count, e.g. paused ones."""
+        self.frame_start = None
+
+    def end_frame(self):
+        """Call after the frame is presented. Records its work time and may change the tier."""
+        if not self.enabled or self.frame_start is None: return
+        now = time.perf_counter()
+        work = now - self.frame_start
+        self.frame_start = None
+        times = self.work_times
+        if len(times) == times.maxlen: self.work_sum -= times[0]
+        times.append(work)
+        self.work_sum += work
+        if len(times) < times.maxlen: return # Decide on full windows only
+
+        load = self.work_sum / len(times) / self.budget
+        if load > QUALITY_DOWN_LOAD:
+            self.headroom_since = None
+            if self.level < len(self.tiers) - 1:
+                if self.last_up is not None and now - self.last_up < self.up_hold:
+                    self.up_hold = min(QUALITY_UP_SECONDS_MAX, self.up_hold * 2) # The last step up didn't hold
+                self.last_up = None
+                self.set_level(self.level + 1)
+                print(f"Quality: frames at {load:.0%} of budget, lowered to '{self.tier['name']}'.")
+        elif load < QUALITY_UP_LOAD:
+            if self.headroom_since is None: self.headroom_since = now
+            elif now - self.headroom_since >= self.up_hold and self.level > 0:
+                self.set_level(self.level - 1)
+                self.last_up = now
+                print(f"Quality: frames at {load:.0%} of budget, raised to '{self.tier['name']}'.")
+        else:
+            self.headroom_since = None
+
+    def set_level(self, level):
+        self.level = max(0, min(len(self.tiers) - 1, level))
+        self.tier = self.tiers[self.level]
+        self.work_times.clear() # Judge the new tier on its own frames
+        self.work_sum = 0.0
+        self.headroom_since = None
+        self.changes += 1
+        for listener in self.listeners: listener(self.tier)
+
+    def metrics_counters(self):
+        return {
+            "game_quality_level": self.level,
+            "game_quality_changes_total": self.changes,
+        }
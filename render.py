@@ -0,0 +1,193 @@
+# render.py
+#
+# Render backends. Game, ui and Assets draw onto the target returned by
+# begin_frame(), which supports the Surface calls they use (blit, blits,
+# fill, get_size), and the frame is shown with present().
+#
+#   SoftwareBackend  Surface.blit onto the display surface (default)
+#   HardwareBackend  pygame._sdl2.video Renderer; each surface is uploaded to
+#                    a texture once and drawn with texture copies after that
+
+import weakref
+import pygame as pg
+# --- Use non-relative import for flat structure ---
+from settings import *
+
+class SoftwareBackend:
+    name = "software"
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.frame = None # Offscreen frame, only used for shaken frames
+        self.offset = (0, 0)
+        self.target = screen
+
+    def on_display_changed(self, screen):
+        self.screen = screen
+        self.frame = None
+
+    def set_fullscreen(self, fullscreen):
+        """Returns False: the caller switches modes with pg.display.set_mode."""
+        return False
+
+    def set_render_scale(self, scale):
+        """Ignored: everything is drawn in screen coordinates, and pg.SCALED already scales to the window."""
+        pass
+
+    def begin_frame(self, offset=(0, 0)):
+        """Returns the target for this frame. Frames drawn with an offset go through an offscreen surface."""
+        self.offset = (int(offset[0]), int(offset[1]))
+        if self.offset == (0, 0):
+            self.target = self.screen
+        else:
+            if self.frame is None or self.frame.get_size() != self.screen.get_size():
+                self.frame = pg.Surface(self.screen.get_size()).convert()
+            self.target = self.frame
+        return self.target
+
+    def present(self):
+        if self.target is not self.screen:
+            self.screen.blit(self.target, self.offset)
+        pg.display.flip()
+
+    def get_size(self):
+        return self.screen.get_size()
+
+    def read_pixels(self, dest):
+        """Copies the last presented frame into `dest`."""
+        dest.blit(self.screen, (0, 0))
+
+    def forget(self, surface):
+        pass
+
+class HardwareBackend:
+    """Draws through an SDL renderer, in its own window.
+
+    Textures are made from a surface's top-level parent, so every sprite look
+    in the atlas shares one texture. Per-surface alpha (set_alpha) is applied
+    at draw time. Surfaces drawn on after their first use must be passed to
+    forget(). Frames are drawn into a target texture that is copied to the
+    window on present, so the last frame can still be read back afterwards.
+    With set_render_scale() that texture is smaller than the logical size,
+    and present stretches it to fit.
+    The display module only keeps a hidden 1x1 window, so that convert()
+    still has a pixel format to convert to.
+    """
+    name = "hardware"
+
+    def __init__(self, size, title=TITLE, fullscreen=False, driver=RENDER_DRIVER):
+        from pygame._sdl2 import video
+        self.video = video
+        pg.display.set_mode((1, 1), pg.HIDDEN)
+        self.size = size
+        self.window = video.Window(title, size)
+        drivers = [info.name for info in video.get_drivers()]
+        index = drivers.index(driver) if driver in drivers else -1
+        if driver and index < 0: print(f"Warning: SDL render driver '{driver}' not available ({', '.join(drivers)}). Using the default.")
+        self.renderer = video.Renderer(self.window, index=index, target_texture=True)
+        self.renderer.logical_size = size # Scales like pg.SCALED
+        self.frame = video.Texture(self.renderer, size, target=True)
+        self.scale = 1.0
+        self.readback = None # Full-size copy of a reduced frame, for read_pixels
+        self.textures = weakref.WeakKeyDictionary() # Top-level surface -> Texture
+        self.offset = (0, 0)
+        if fullscreen: self.set_fullscreen(True)
+
+    @classmethod
+    def create(cls, size, title=TITLE, fullscreen=False):
+        """Returns a HardwareBackend, or None (after a warning) if SDL can't provide one."""
+        try:
+            return cls(size, title, fullscreen)
+        except (ImportError, pg.error) as e:
+            print(f"Warning: Could not create hardware renderer ({e}). Using the software backend.")
+            return None
+
+    def on_display_changed(self, screen):
+        pass
+
+    def set_fullscreen(self, fullscreen):
+        if fullscreen: self.window.set_fullscreen(True)
+        else: self.window.set_windowed()
+        return True
+
+    def set_render_scale(self, scale):
+        if scale == self.scale: return
+        self.scale = scale
+        size = (max(1, round(self.size[0] * scale)), max(1, round(self.size[1] * scale)))
+        self.frame = self.video.Texture(self.renderer, size, target=True)
+        self.readback = None
+
+    def begin_frame(self, offset=(0, 0)):
+        self.offset = (int(offset[0]), int(offset[1]))
+        self.renderer.target = self.frame
+        if self.scale != 1.0: self.renderer.scale = (self.scale, self.scale) # Reset by every target change
+        return self
+
+    def present(self):
+        renderer = self.renderer
+        renderer.target = None
+        renderer.draw_color = (*BLACK, 255)
+        renderer.clear()
+        self.frame.draw(dstrect=(self.offset[0], self.offset[1], self.size[0], self.size[1]))
+        renderer.present()
+
+    def read_pixels(self, dest):
+        self.renderer.target = self.frame
+        if self.scale == 1.0:
+            self.renderer.to_surface(dest)
+        else:
+            if self.readback is None: self.readback = pg.Surface(self.frame.get_rect().size).convert()
+            self.renderer.to_surface(self.readback)
+            pg.transform.scale(self.readback, dest.get_size(), dest)
+        self.renderer.target = None
+        self.forget(dest)
+
+    def forget(self, surface):
+        self.textures.pop(surface.get_abs_parent(), None)
+
+    def texture(self, surface):
+        root = surface.get_abs_parent()
+        texture = self.textures.get(root)
+        if texture is None:
+            texture = self.video.Texture.from_surface(self.renderer, root)
+            texture.blend_mode = 1 # SDL_BLENDMODE_BLEND, so set_alpha works on opaque surfaces too
+            self.textures[root] = texture
+        return texture
+
+    # --- Surface-like drawing API ---
+
+    def get_size(self):
+        return self.size
+
+    def get_width(self):
+        return self.size[0]
+
+    def get_height(self):
+        return self.size[1]
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        texture = self.texture(source)
+        x, y = source.get_abs_offset()
+        width, height = source.get_size()
+        if area is not None:
+            area = pg.Rect(area).clip((0, 0, width, height))
+            x, y, width, height = x + area.x, y + area.y, area.width, area.height
+        if len(dest) == 4: dest = dest[:2] # Rects: only the position counts, as with Surface.blit
+        alpha = source.get_alpha()
+        texture.alpha = 255 if alpha is None else alpha
+        rect = pg.Rect(dest[0], dest[1], width, height)
+        texture.draw(srcrect=(x, y, width, height), dstrect=rect)
+        return rect
+
+    def blits(self, blit_sequence, doreturn=True):
+        rects = [self.blit(*args) for args in blit_sequence]
+        return rects if doreturn else None
+
+    def fill(self, color, rect=None, special_flags=0):
+        color = pg.Color(color)
+        renderer = self.renderer
+        renderer.draw_color = color
+        renderer.draw_blend_mode = 1 if color.a < 255 else 0
+        rect = pg.Rect(rect) if rect is not None else pg.Rect((0, 0), self.size)
+        renderer.fill_rect(rect)
+        return rect
@@ -0,0 +1,225 @@
+# server.py
+#
+# Authoritative asyncio UDP server for network play. One process hosts many
+# matches; a single tick loop steps all of them at NET_TICK_RATE and sends
+# each client a delta-compressed state.
+#
+#     python server.py                      # listen on 0.0.0.0:NET_PORT
+#     python server.py --host 127.0.0.1 --port 50007
+
+import argparse
+import asyncio
+import time
+from array import array
+# --- Use non-relative import for flat structure ---
+from settings import *
+from spawner import load_waves
+from netsim import MatchSimulation, MODE_VERSUS, MODE_COOP
+import protocol
+
+MAX_INPUT_BACKLOG = 10 # Inputs queued per client before the oldest are dropped
+
+class ClientSession:
+    __slots__ = ("addr", "player_id", "match", "inputs", "last_seq", "last_direction",
+                 "ack_tick", "sent", "last_heard")
+
+    def __init__(self, addr, player_id, match, now):
+        self.addr = addr
+        self.player_id = player_id
+        self.match = match
+        self.inputs = {} # seq -> (direction, jump), not yet simulated
+        self.last_seq = 0 # Newest input applied by the simulation
+        self.last_direction = 0
+        self.ack_tick = protocol.NO_BASELINE # Newest state the client has confirmed
+        self.sent = {} # tick -> items sent, kept as possible delta baselines
+        self.last_heard = now
+
+    def next_input(self):
+        """Input for this tick: the next queued one, or keep moving the same way without jumping."""
+        if len(self.inputs) > MAX_INPUT_BACKLOG:
+            for seq in sorted(self.inputs)[:-MAX_INPUT_BACKLOG]: del self.inputs[seq]
+            self.last_seq = min(self.inputs) - 1
+        entry = self.inputs.pop(self.last_seq + 1, None)
+        if entry is None: return self.last_direction, False
+        self.last_seq += 1
+        self.last_direction = entry[0]
+        return entry
+
+class Match:
+    def __init__(self, match_id, name, mode, waves):
+        self.match_id = match_id
+        self.name = name
+        self.mode = mode
+        self.sim = MatchSimulation(mode, seed=match_id, waves=waves)
+        self.sessions = []
+        self.started = False
+        self.next_player_id = 1 # Never reused within the match, even after a player leaves
+
+    def is_open(self):
+        return not self.started and len(self.sessions) < NET_MAX_PLAYERS
+
+class GameServer(asyncio.DatagramProtocol):
+    def __init__(self, tick_rate=NET_TICK_RATE, waves=None):
+        self.tick_rate = tick_rate
+        self.waves = waves or load_waves()
+        self.transport = None
+        self.sessions = {} # addr -> ClientSession
+        self.matches = {} # match_id -> Match
+        self.next_match_id = 1
+        # Metrics
+        self.tick_times = array('d', bytes(8 * 1024)) # Ring buffer of tick durations (s)
+        self.tick_count = 0
+        self.late_ticks = 0
+        self.packets_in = 0
+        self.packets_out = 0
+        self.bytes_out = 0
+        self.bad_packets = 0
+
+    # --- asyncio.DatagramProtocol ---
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.packets_in += 1
+        try:
+            kind = protocol.message_type(data)
+            if kind == protocol.MSG_HELLO: self._on_hello(data, addr)
+            elif kind == protocol.MSG_INPUT: self._on_input(data, addr)
+            elif kind == protocol.MSG_BYE: self._remove_session(addr)
+            else: self.bad_packets += 1
+        except protocol.ProtocolError:
+            self.bad_packets += 1
+
+    def _send(self, data, addr):
+        self.transport.sendto(data, addr)
+        self.packets_out += 1
+        self.bytes_out += len(data)
+
+    def _on_hello(self, data, addr):
+        mode, name = protocol.decode_hello(data)
+        session = self.sessions.get(addr)
+        if session is None:
+            mode = MODE_COOP if mode == MODE_COOP else MODE_VERSUS
+            match = next((m for m in self.matches.values() if m.is_open() and m.mode == mode and m.name == name), None)
+            if match is None:
+                match = Match(self.next_match_id, name, mode, self.waves)
+                self.matches[match.match_id] = match
+                self.next_match_id += 1
+            player_id = match.next_player_id
+            match.next_player_id += 1
+            session = ClientSession(addr, player_id, match, time.monotonic())
+            match.sessions.append(session)
+            match.sim.add_player(player_id)
+            self.sessions[addr] = session
+            if len(match.sessions) == NET_MAX_PLAYERS: match.started = True
+        session.last_heard = time.monotonic()
+        # Resent on every HELLO, since the client retries until it gets one
+        self._send(protocol.encode_welcome(session.player_id, self.tick_rate, session.match.match_id), addr)
+
+    def _on_input(self, data, addr):
+        session = self.sessions.get(addr)
+        if session is None: return
+        ack_tick, inputs = protocol.decode_input(data)
+        session.last_heard = time.monotonic()
+        if ack_tick != protocol.NO_BASELINE and (session.ack_tick == protocol.NO_BASELINE or ack_tick > session.ack_tick):
+            session.ack_tick = ack_tick
+        for seq, direction, jump in inputs:
+            if seq > session.last_seq: session.inputs[seq] = (max(-1, min(1, direction)), jump)
+
+    def _remove_session(self, addr):
+        session = self.sessions.pop(addr, None)
+        if session is None: return
+        match = session.match
+        if session in match.sessions: match.sessions.remove(session)
+        match.sim.remove_player(session.player_id)
+        if not match.sessions: self.matches.pop(match.match_id, None)
+
+    # --- Simulation ---
+
+    def tick(self):
+        dt = 1.0 / self.tick_rate
+        now = time.monotonic()
+        for session in [s for s in self.sessions.values() if now - s.last_heard > NET_CLIENT_TIMEOUT]:
+            self._remove_session(session.addr)
+
+        for match in list(self.matches.values()):
+            sim = match.sim
+            if match.started and not sim.is_over():
+                sim.step({s.player_id: s.next_input() for s in match.sessions}, dt)
+            self._broadcast(match)
+
+    def _broadcast(self, match):
+        sim = match.sim
+        flags = (protocol.FLAG_STARTED if match.started else 0) | (protocol.FLAG_OVER if sim.is_over() else 0)
+        players = [(p.player_id, p.x, p.y, p.vel_y, p.on_ground, p.alive, p.score) for p in sim.players.values()]
+        items = {item.item_id: (int(round(item.x)), int(round(item.y)), item.obstacle) for item in sim.items.values()}
+        for session in match.sessions:
+            baseline = session.sent.get(session.ack_tick)
+            data = protocol.encode_state(sim.tick, session.last_seq, flags, players, items,
+                                         session.ack_tick, baseline)
+            session.sent[sim.tick] = items
+            if len(session.sent) > NET_STATE_HISTORY:
+                for tick in sorted(session.sent)[:-NET_STATE_HISTORY]: del session.sent[tick]
+            self._send(data, session.addr)
+
+    async def run(self):
+        """Steps every match at the tick rate, on a fixed schedule that catches up after slow ticks."""
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / self.tick_rate
+        next_tick = loop.time()
+        next_report = time.monotonic() + NET_METRICS_INTERVAL
+        while True:
+            start = time.perf_counter()
+            self.tick()
+            elapsed = time.perf_counter() - start
+            self.tick_times[self.tick_count % len(self.tick_times)] = elapsed
+            self.tick_count += 1
+            if elapsed > interval: self.late_ticks += 1
+            if time.monotonic() >= next_report:
+                self.report()
+                next_report += NET_METRICS_INTERVAL
+            next_tick += interval
+            delay = next_tick - loop.time()
+            if delay < -interval * 5: next_tick = loop.time() # Too far behind: don't burst to catch up
+            await asyncio.sleep(max(0.0, delay))
+
+    def metrics(self):
+        samples = sorted(self.tick_times[:min(self.tick_count, len(self.tick_times))])
+        pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] * 1000.0 if samples else 0.0
+        return {
+            "matches": len(self.matches),
+            "clients": len(self.sessions),
+            "ticks": self.tick_count,
+            "late_ticks": self.late_ticks,
+            "tick_ms_p50": round(pick(0.50), 3),
+            "tick_ms_p95": round(pick(0.95), 3),
+            "tick_ms_max": round(samples[-1] * 1000.0, 3) if samples else 0.0,
+            "packets_in": self.packets_in,
+            "packets_out": self.packets_out,
+            "bytes_out": self.bytes_out,
+            "bad_packets": self.bad_packets,
+        }
+
+    def report(self):
+        print("Server: " + "  ".join(f"{key}={value}" for key, value in self.metrics().items()))
+
+async def serve(host="0.0.0.0", port=NET_PORT, tick_rate=NET_TICK_RATE):
+    loop = asyncio.get_running_loop()
+    transport, server = await loop.create_datagram_endpoint(lambda: GameServer(tick_rate), local_addr=(host, port))
+    print(f"Serving matches on {host}:{port} at {tick_rate} ticks/s")
+    try:
+        await server.run()
+    finally:
+        transport.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the network play server.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=NET_PORT)
+    parser.add_argument("--tick-rate", type=int, default=NET_TICK_RATE)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.tick_rate))
+    except KeyboardInterrupt:
+        pass
@@ -9,19 +9,37 @@ SCREEN_HEIGHT = 900    # Increased height for better gameplay
 FPS = 60
 GAME_FONT = None
 USE_DELTA_TIME = True
+SURFACE_FORMAT_DEBUG = False # Warn about blits from surfaces not in the display format
+LATENCY_TRACE = False  # Record input-to-flip latency histograms, printed on quit
+LOW_LATENCY_MODE = False # Sample input as late as possible before each frame
+LOW_LATENCY_MARGIN = 0.002 # Seconds of slack left before each frame's present deadline
 
 # --- Window Settings ---
 WINDOW_FLAGS = pg.RESIZABLE | pg.SCALED
 FULLSCREEN_FLAGS = pg.FULLSCREEN | pg.SCALED
 DEFAULT_FULLSCREEN = False
 FULLSCREEN_TOGGLE_KEY = pg.K_F11
+RENDER_BACKEND = "software" # "software" (Surface.blit) or "hardware" (SDL renderer with textures)
+RENDER_DRIVER = None        # SDL render driver for the hardware backend, e.g. "software" on machines without a GPU
+
+# --- Input Settings ---
+INPUT_EVENTS = (pg.QUIT, pg.WINDOWCLOSE, pg.KEYDOWN) # The only events SDL queues; held keys are read with pg.key.get_pressed
+INPUT_QUEUE_SIZE = 256      # Timestamped inputs waiting for the game; the oldest are dropped beyond this
 
 # --- File Paths ---
 HIGHSCORE_FILE = "data/game_data.json"
-FONT_NAME = pg.font.match_font('arial')
+SPAWN_WAVES_FILE = "data/spawn_waves.json"
+FONT_FAMILY = 'arial'
+FONT_CACHE_FILE = "data/font_cache.json" # Resolved font path, avoids fontconfig on startup
 SOUND_DIR = "assets/sounds"
 COLLECT_SOUND = "collect.wav"
 HIT_SOUND = "hit.wav"
+AUDIO_CATEGORIES = {"impact": 2, "pickup": 6, "ui": 2} # Mixer channels reserved per category
+SOUND_BANK = { # name: (category, priority, pitch variants, volume variants)
+    "hit": ("impact", 10, (1.0,), (1.0,)),
+    "collect": ("pickup", 1, (0.94, 1.0, 1.06), (0.85, 1.0)),
+}
+SOUND_RATE_LIMIT = 0.03 # Seconds within which the same sound isn't started again
 IMG_DIR = "assets/images"
 
 # --- Player Settings ---
@@ -33,6 +51,8 @@ PLAYER_JUMP_POWER = -15 # Stronger jump
 PLAYER_GROUND_Y_OFFSET = 20
 PLAYER_START_POS = (SCREEN_WIDTH // 2, SCREEN_HEIGHT - PLAYER_HEIGHT - PLAYER_GROUND_Y_OFFSET)
 PLAYER_HIT_FLASH_DURATION = 0.15
+PLAYER_FLASH_ALPHA = 100   # Strength of the flash tint at full intensity
+PLAYER_FLASH_STEPS = 4     # Pre-tinted frames the flash fades through
 
 # --- Item & Obstacle Settings ---
 ITEM_SIZE_COLLECTIBLE = 30
@@ -45,15 +65,84 @@ COLLECTIBLE_PROBABILITY_BASE = 0.60
 COLLECTIBLE_PULSE_SPEED = 4
 COLLECTIBLE_PULSE_AMOUNT = 0.08
 
+# --- Rewind Settings ---
+REWIND_BUFFER_SECONDS = 5.0   # Simulation history kept for rewinding
+SNAPSHOT_MAX_ITEMS = 64       # Items per snapshot before its buffer has to grow
+PRACTICE_MODE = False         # Rewind instead of ending the game on a hit
+PRACTICE_REWIND_SECONDS = 2.0
+
+# --- Autoplay Bot Settings (soak testing) ---
+BOT_LOOKAHEAD = 1.0        # Seconds of falling items the bot considers
+BOT_SAFETY_MARGIN = 6      # Extra pixels kept between the player and obstacles
+BOT_TARGET_STEP = 20       # Spacing of the x positions the bot considers moving to
+BOT_JUMP_CHANCE = 0.0005   # Per-tick chance of a jump when nothing is close
+SOAK_REPORT_INTERVAL = 10.0 # Seconds between soak report rows
+
+# --- Network Play Settings ---
+NET_PORT = 50007
+NET_TICK_RATE = 60           # Server simulation ticks per second
+NET_MAX_PLAYERS = 2          # Players per match
+NET_CLIENT_TIMEOUT = 5.0     # Seconds without packets before a client is dropped
+NET_STATE_HISTORY = 64       # Sent/received states kept as delta baselines
+NET_METRICS_INTERVAL = 10.0  # Seconds between server metrics reports
+
+# --- Metrics Export Settings ---
+METRICS_EXPORT = None          # None (off), "http" (Prometheus text on METRICS_HOST:METRICS_PORT) or "file"
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = 9108
+METRICS_FILE = "data/metrics.prom" # Rewritten atomically, for a textfile collector
+METRICS_PUBLISH_INTERVAL = 1.0 # Seconds between snapshots handed from the game loop to the exporter
+METRICS_WINDOW = 4096          # Recent frames used for frame-time quantiles
+
+# --- Capture Settings (highlights) ---
+CAPTURE_MODE = False      # Keep recent gameplay frames and save them after a new high score
+CAPTURE_FPS = 30
+CAPTURE_SCALE = 0.5       # Captured frame size relative to the screen
+CAPTURE_POOL_SIZE = 8     # Preallocated frame buffers; frames are dropped while all are in use
+HIGHLIGHT_SECONDS = 30.0
+CAPTURE_DIR = "captures"
+CAPTURE_FORMAT = "auto"   # "auto" (ffmpeg if installed, else "png"), "ffmpeg", "png" or "raw"
+
+# --- Memory Diagnostics Settings ---
+MEMORY_DIAGNOSTICS = False      # Track object/surface counts and per-game allocation growth; report on exit
+MEMORY_REPORT_FILE = "memory_report.txt"
+MEMORY_SAMPLE_INTERVAL = 30.0   # Seconds between periodic count samples
+MEMORY_TRACE_FRAMES = 1         # Stack depth recorded by tracemalloc
+MEMORY_TOP_STATS = 10           # Allocation sites listed per reset
+
+# --- Quality Governor Settings ---
+QUALITY_GOVERNOR = True        # Lower visual quality while frames run over budget, raise it again when there is headroom
+QUALITY_TIERS = ( # Best first. Only visuals change between tiers, never the simulation.
+    # particles: share of collect particles drawn; pulse: animated collectibles; popup_fade: fading score popups;
+    # overlays: translucent full-screen overlays (else a solid fill); shake: screen shake; render_scale: hardware backend frame resolution
+    {"name": "high",    "particles": 1.0, "pulse": True,  "popup_fade": True,  "overlays": True,  "shake": True,  "render_scale": 1.0},
+    {"name": "medium",  "particles": 0.6, "pulse": True,  "popup_fade": False, "overlays": True,  "shake": True,  "render_scale": 1.0},
+    {"name": "low",     "particles": 0.2, "pulse": False, "popup_fade": False, "overlays": False, "shake": False, "render_scale": 0.75},
+    {"name": "minimal", "particles": 0.0, "pulse": False, "popup_fade": False, "overlays": False, "shake": False, "render_scale": 0.5},
+)
+QUALITY_WINDOW = 30            # Gameplay frames averaged for each decision
+QUALITY_DOWN_LOAD = 0.85       # Step down when frame work averages more than this share of the frame budget
+QUALITY_UP_LOAD = 0.5          # Step up when it stays under this share...
+QUALITY_UP_SECONDS = 5.0       # ...for this many seconds
+QUALITY_UP_SECONDS_MAX = 60.0  # The wait doubles, up to this, whenever a step up has to be undone
+
 # --- Visual & UI Settings ---
 BG_COLOR_DARK_START = (15, 15, 35)    # Darker, more professional blue
 BG_COLOR_LIGHT_START = (35, 35, 65)   # Richer gradient
 POPUP_DURATION_FRAMES = 35
 POPUP_SPEED = 2.0
+POPUP_CAPACITY = 32         # Popups on screen at once; the oldest is replaced when full
+POPUP_FADE_STEPS = 16       # Pre-faded frames per popup text
+POPUP_GLYPH_CACHE_SIZE = 64 # Distinct popup texts kept rendered
+TEXT_CACHE_SIZE = 128        # Rendered UI strings kept by draw_text
 SCORE_MILESTONE = 10
 TRANSITION_SPEED = 3
+TRANSITION_TYPE = "fade"    # "fade", "wipe" or "crossfade"
 SCREEN_SHAKE_DURATION = 0.12
 SCREEN_SHAKE_INTENSITY = 3
+LAYER_PLAYER = 0           # Draw layers; higher layers are drawn on top
+LAYER_ITEMS = 1
+LAYER_PARTICLES = 2
 
 # --- Colors ---
 WHITE = (255, 255, 255)
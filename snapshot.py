@@ -0,0 +1,132 @@
+# snapshot.py
+
+from array import array
+# --- Use non-relative import for flat structure ---
+from settings import *
+from sprites import Item
+
+ITEM_TYPES = ('collectible', 'obstacle') # Stored as their index
+ITEM_FIELDS = 4 # x, y, type index, pulse offset
+PLAYER_FIELDS = 6 # pos.x, pos.y, vel.x, vel.y, on_ground, is_jumping
+
+class GameSnapshot:
+    """Compact copy of the simulation state at one tick: player, items, score and spawner position.
+
+    Numbers live in preallocated arrays, so capturing into an existing
+    snapshot allocates nothing. Entities, surfaces and cosmetic state
+    (particles, popups, shake) are not stored; they are rebuilt on restore.
+    """
+    __slots__ = ("sim_time", "score", "player", "item_count", "items",
+                 "spawn_timeline", "spawn_index", "spawn_end_time", "spawn_rng_state")
+
+    def __init__(self, max_items=SNAPSHOT_MAX_ITEMS):
+        self.sim_time = -1.0
+        self.score = 0
+        self.player = array('d', bytes(8 * PLAYER_FIELDS))
+        self.item_count = 0
+        self.items = array('d', bytes(8 * ITEM_FIELDS * max_items))
+        self.spawn_timeline = None
+        self.spawn_index = 0
+        self.spawn_end_time = 0.0
+        self.spawn_rng_state = None
+
+    def capture(self, game):
+        self.sim_time = game.sim_time
+        self.score = game.score
+
+        player = self.player
+        if game.player:
+            p = game.player
+            player[0] = p.pos.x; player[1] = p.pos.y
+            player[2] = p.vel.x; player[3] = p.vel.y
+            player[4] = p.on_ground; player[5] = p.is_jumping
+
+        count = len(game.items_group)
+        items = self.items
+        if count * ITEM_FIELDS > len(items): # Rare: grow once and keep the larger buffer
+            items.extend([0.0] * (count * ITEM_FIELDS - len(items)))
+        i = 0
+        for item in game.items_group:
+            items[i] = item.pos.x; items[i + 1] = item.pos.y
+            items[i + 2] = ITEM_TYPES.index(item.type); items[i + 3] = item.pulse_offset
+            i += ITEM_FIELDS
+        self.item_count = count
+
+        spawner = game.spawner
+        self.spawn_timeline = spawner.timeline # Compiled timelines are never mutated, so a reference is enough
+        self.spawn_index = spawner.index
+        self.spawn_end_time = spawner.end_time
+        self.spawn_rng_state = spawner.rng_state
+
+    def restore(self, game):
+        game.sim_time = self.sim_time
+        game.score = self.score
+        game.item_speed = min(MAX_ITEM_SPEED, BLOCK_SPEED_START + game.score * SPEED_INCREMENT_PER_SCORE)
+
+        if game.player:
+            p, player = game.player, self.player
+            p.pos.x, p.pos.y = player[0], player[1]
+            p.vel.x, p.vel.y = player[2], player[3]
+            p.on_ground, p.is_jumping = bool(player[4]), bool(player[5])
+            p.rect.center = round(p.pos.x), round(p.pos.y)
+            p.is_flashing = False; p.flash_timer = 0
+            p.image = p.original_image
+
+        for item in game.items_group: item.kill()
+        for sprite in game.particles_group: sprite.kill()
+        items = self.items
+        for i in range(0, self.item_count * ITEM_FIELDS, ITEM_FIELDS):
+            item = Item(items[i], ITEM_TYPES[int(items[i + 2])], game.assets)
+            item.pulse_offset = items[i + 3]
+            item.pos.update(items[i], items[i + 1])
+            item.rect.center = round(item.pos.x), round(item.pos.y)
+            game.all_sprites.add(item)
+            game.items_group.add(item)
+
+        spawner = game.spawner
+        spawner.timeline = self.spawn_timeline
+        spawner.index = self.spawn_index
+        spawner.end_time = self.spawn_end_time
+        spawner.rng_state = self.spawn_rng_state
+        if self.spawn_rng_state is not None: spawner.rng.setstate(self.spawn_rng_state)
+        game.popups.clear()
+        game.shake_timer = 0.0
+
+class SnapshotRing:
+    """Fixed-size ring of GameSnapshots captured every tick, for rewind and restore."""
+    def __init__(self, capacity=int(REWIND_BUFFER_SECONDS * FPS), max_items=SNAPSHOT_MAX_ITEMS):
+        self.slots = [GameSnapshot(max_items) for _ in range(max(1, capacity))]
+        self.head = 0 # Next slot to overwrite
+        self.count = 0
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+    def capture(self, game):
+        self.slots[self.head].capture(game)
+        self.head = (self.head + 1) % len(self.slots)
+        self.count = min(self.count + 1, len(self.slots))
+
+    def latest(self, back=0):
+        """Snapshot `back` ticks before the newest one, or None."""
+        if back >= self.count: return None
+        return self.slots[(self.head - 1 - back) % len(self.slots)]
+
+    def find(self, sim_time):
+        """Newest snapshot taken at or before `sim_time`; the oldest one if none is that old."""
+        for back in range(self.count):
+            snapshot = self.latest(back)
+            if snapshot.sim_time <= sim_time: return snapshot
+        return self.latest(self.count - 1)
+
+    def rewind(self, game, seconds):
+        """Restores the state from `seconds` ago and forgets everything newer. Returns False if empty."""
+        snapshot = self.find(game.sim_time - seconds)
+        if snapshot is None: return False
+        snapshot.restore(game)
+        # Drop the snapshots after the restored one, so the next capture continues from it
+        while self.count and self.latest() is not snapshot:
+            self.head = (self.head - 1) % len(self.slots)
+            self.count -= 1
+        return True
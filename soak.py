@@ -0,0 +1,80 @@
+# soak.py
+#
+# Unattended soak test: the autoplay bot plays game after game while the
+# profiler records frame times and RSS.
+#
+#     python soak.py --hours 8 --report soak_report.csv             # rendered, 60 FPS
+#     python soak.py --hours 8 --headless --report soak_report.csv  # no window, uncapped
+#
+# Stats go to a separate save file so soak runs don't touch real highscores.
+
+import argparse
+import os
+import sys
+import time
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the autoplay bot for a long session and profile it.")
+    parser.add_argument("--hours", type=float, default=1.0, help="Wall-clock duration of the run")
+    parser.add_argument("--headless", action="store_true", help="Use SDL's dummy video/audio drivers and don't cap the frame rate")
+    parser.add_argument("--report", default="soak_report.csv", help="CSV file for the periodic report rows")
+    parser.add_argument("--save-file", default="data/soak_game_data.json", help="Save file used instead of the real one")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the bot and spawn patterns")
+    return parser.parse_args(argv)
+
+def run_soak(args):
+    if args.headless:
+        # Must be set before pygame initializes its video/audio subsystems
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+    import random
+    import pygame as pg
+    from settings import SCREEN_WIDTH, SCREEN_HEIGHT, WINDOW_FLAGS, FPS, SOAK_REPORT_INTERVAL, TITLE
+    from assets import Assets
+    from persistence import Persistence
+    from game import Game
+    from bot import AutoplayBot
+    from profiler import FrameProfiler
+
+    if args.seed is not None: random.seed(args.seed)
+    pg.display.init()
+    pg.font.init()
+    screen = pg.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), 0 if args.headless else WINDOW_FLAGS)
+    pg.display.set_caption(f"{TITLE} (soak)")
+    clock = pg.time.Clock()
+    assets = Assets()
+    assets.load()
+    persistence = Persistence(args.save_file)
+
+    game = Game(screen, clock, assets, persistence)
+    game.input_source = AutoplayBot(game, seed=args.seed)
+    game.reset()
+    profiler = FrameProfiler(args.report, SOAK_REPORT_INTERVAL)
+    games = 0
+    end_time = time.perf_counter() + args.hours * 3600.0
+
+    while time.perf_counter() < end_time:
+        if args.headless: dt = 1.0 / FPS
+        else: dt = min(0.1, clock.tick(FPS) / 1000.0)
+        for event in pg.event.get():
+            if event.type == pg.QUIT: end_time = 0
+
+        frame_start = time.perf_counter()
+        alive = game.step(dt)
+        game.draw()
+        profiler.record_frame(time.perf_counter() - frame_start)
+        game.memory.tick()
+
+        if not alive:
+            games += 1
+            game.reset()
+        if profiler.due():
+            profiler.report(games, persistence.save_count, len(game.all_sprites), game.popups.live)
+
+    profiler.report(games, persistence.save_count, len(game.all_sprites), game.popups.live)
+    game.memory.report()
+    pg.quit()
+
+if __name__ == '__main__':
+    run_soak(parse_args())
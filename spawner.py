@@ -0,0 +1,117 @@
+# spawner.py
+#
+# Data-driven item spawning. Waves are read from SPAWN_WAVES_FILE, e.g.:
+#
+#     {"loop_from": 1,
+#      "waves": [{"name": "classic", "duration": 45},
+#                {"name": "lanes", "duration": 30, "interval": 0.4, "end_interval": 0.3,
+#                 "lanes": 8, "lane_pattern": [0, 2, 4, 6, 7, 5, 3, 1]},
+#                {"name": "bursts", "duration": 30, "interval": 0.5,
+#                 "burst": {"count": 3, "spacing": 0.1}, "gap_every": 8, "gap": 1.2}]}
+#
+# Wave fields (all optional except duration):
+#   interval / end_interval   seconds between spawns, ramped linearly across the wave
+#   collectible_probability   chance that a spawn is a collectible instead of an obstacle
+#   lanes                     spawn at evenly spaced lane centres instead of any x
+#   lane_pattern              lane indices to cycle through instead of random lanes
+#   burst                     {"count", "spacing"}: several items per spawn, `spacing` seconds apart
+#   gap_every / gap           pause `gap` seconds after every `gap_every` spawns
+#
+# Waves are compiled ahead of time into a sorted timeline of (time, x, type)
+# events. Once the timeline runs out, the waves from `loop_from` on are
+# compiled again after it, so play is endless.
+
+import json
+import random
+# --- Use non-relative import for flat structure ---
+from settings import *
+
+def classic_waves():
+    """The original fixed-rate uniform spawning, used when no wave file is available."""
+    return {"loop_from": 0, "waves": [{"name": "classic", "duration": 60.0}]}
+
+def load_waves(path=SPAWN_WAVES_FILE):
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        if not data.get("waves"): raise ValueError("no waves defined")
+        for wave in data["waves"]:
+            if float(wave["duration"]) <= 0: raise ValueError(f"wave '{wave.get('name')}' has no duration")
+        return data
+    except (IOError, json.JSONDecodeError, ValueError, KeyError, TypeError) as e:
+        print(f"Warning: Could not load spawn waves from '{path}' ({e}). Using classic spawning.")
+        return classic_waves()
+
+def compile_wave(wave, start_time, rng):
+    """Expands one wave definition into (time, x, type) events starting at `start_time`."""
+    default_interval = ITEM_SPAWN_BASE_RATE / FPS
+    duration = float(wave["duration"])
+    interval = float(wave.get("interval", default_interval))
+    end_interval = float(wave.get("end_interval", interval))
+    probability = float(wave.get("collectible_probability", COLLECTIBLE_PROBABILITY_BASE))
+    lanes = int(wave.get("lanes", 0))
+    lane_pattern = wave.get("lane_pattern") or []
+    burst = wave.get("burst") or {}
+    burst_count = max(1, int(burst.get("count", 1)))
+    burst_spacing = float(burst.get("spacing", 0.0))
+    gap_every = int(wave.get("gap_every", 0))
+    gap = float(wave.get("gap", 0.0))
+
+    min_x = ITEM_SIZE_OBSTACLE // 2
+    max_x = SCREEN_WIDTH - ITEM_SIZE_OBSTACLE // 2
+    lane_width = (max_x - min_x) / lanes if lanes > 0 else 0
+
+    events = []
+    t = interval
+    spawns = 0
+    while t < duration:
+        for i in range(burst_count):
+            if lanes > 0:
+                if lane_pattern: lane = int(lane_pattern[(spawns * burst_count + i) % len(lane_pattern)]) % lanes
+                else: lane = rng.randrange(lanes)
+                x_pos = int(min_x + lane_width * (lane + 0.5))
+            else:
+                x_pos = rng.randint(min_x, max_x)
+            itype = 'collectible' if rng.random() < probability else 'obstacle'
+            events.append((start_time + t + i * burst_spacing, x_pos, itype))
+        spawns += 1
+        if gap_every and spawns % gap_every == 0: t += gap
+        t += max(0.01, interval + (end_interval - interval) * (t / duration))
+    return events, start_time + duration
+
+class SpawnScheduler:
+    """Pops precompiled spawn events that are due on the simulation clock."""
+    def __init__(self, waves):
+        self.waves = waves["waves"]
+        self.loop_from = min(max(0, int(waves.get("loop_from", 0))), len(self.waves) - 1)
+        self.rng = random.Random()
+        self.timeline = []
+        self.index = 0
+        self.end_time = 0.0
+        self.rng_state = None # RNG state after the last compile, for snapshots
+
+    def reset(self, seed=None):
+        self.rng.seed(seed)
+        self.timeline = []
+        self.index = 0
+        self.end_time = 0.0
+        self._compile(self.waves)
+
+    def _compile(self, waves):
+        events = []
+        for wave in waves:
+            wave_events, self.end_time = compile_wave(wave, self.end_time, self.rng)
+            events.extend(wave_events)
+        events.sort()
+        self.timeline = events
+        self.index = 0
+        self.rng_state = self.rng.getstate()
+
+    def pop_due(self, now):
+        """Returns the next (time, x, type) event due at `now`, or None."""
+        if self.index >= len(self.timeline) and now >= self.end_time:
+            self._compile(self.waves[self.loop_from:]) # Runs once per loop, not per tick
+        event = self.timeline[self.index] if self.index < len(self.timeline) else None
+        if event is None or event[0] > now: return None
+        self.index += 1
+        return event
@@ -5,59 +5,53 @@ import random
 import math
 # --- Use non-relative import for flat structure ---
 from settings import *
+from entities import Entity
 
 vec = pg.math.Vector2
 
-class Player(pg.sprite.Sprite):
-    def __init__(self, assets):
+class KeyboardInput:
+    """Reads the player's movement from the arrow keys. Jumps arrive as KEYDOWN events in Game."""
+    def get_move_direction(self, player):
+        keys = pg.key.get_pressed()
+        direction = 0
+        if keys[pg.K_LEFT]: direction = -1
+        if keys[pg.K_RIGHT]: direction = 1
+        return direction
+
+    def wants_jump(self, player):
+        return False
+
+class Player(Entity):
+    __slots__ = ("assets", "input_source", "skin", "original_image", "pos", "vel", "is_jumping", "on_ground",
+                 "flash_timer", "flash_duration", "flash_color", "flash_frames", "is_flashing")
+    layer = LAYER_PLAYER
+
+    def __init__(self, assets, input_source=None):
         super().__init__()
         self.assets = assets
-        self.image = pg.Surface((PLAYER_BASE, PLAYER_HEIGHT), pg.SRCALPHA)
+        self.input_source = input_source or KeyboardInput()
+        self.skin = "player"
+        self.original_image = assets.get_image(self.skin)
+        self.image = self.original_image
         self.rect = self.image.get_rect()
-        self._draw_player_shape(BLUE)
-        self.original_image = self.image.copy()
         self.rect.midbottom = (PLAYER_START_POS[0], PLAYER_GROUND_Y)
         self.pos = vec(self.rect.centerx, self.rect.centery)
         self.vel = vec(0, 0)
         self.is_jumping = False
         self.on_ground = True
         self.flash_timer = 0.0
+        self.flash_duration = 0.0
         self.flash_color = WHITE
+        self.flash_frames = ()
         self.is_flashing = False
 
-    def _draw_player_shape(self, color):
-        """Draws a more polished player shape."""
-        self.image.fill((0,0,0,0))  # Clear with transparency
-        
-        # Main body (rounded triangle)
-        points = [
-            (self.rect.width // 2, 0),  # Top point
-            (0, self.rect.height),      # Bottom left
-            (self.rect.width, self.rect.height)  # Bottom right
-        ]
-        
-        # Draw main shape with gradient
-        gradient_surface = pg.Surface((self.rect.width, self.rect.height), pg.SRCALPHA)
-        for y in range(self.rect.height):
-            alpha = int(255 * (1 - y / self.rect.height * 0.3))  # Fade to slightly transparent
-            pg.draw.line(gradient_surface, (*color, alpha), (0, y), (self.rect.width, y))
-        
-        # Draw the gradient shape
-        mask = pg.Surface((self.rect.width, self.rect.height), pg.SRCALPHA)
-        pg.draw.polygon(mask, (255, 255, 255, 255), points)
-        gradient_surface.blit(mask, (0, 0), special_flags=pg.BLEND_RGBA_MULT)
-        self.image.blit(gradient_surface, (0, 0))
-        
-        # Draw outline with anti-aliasing
-        pg.draw.polygon(self.image, (*BLACK, 180), points, 2)
-        
-        # Add highlight
-        highlight_points = [
-            (self.rect.width // 2, 2),
-            (self.rect.width // 4, self.rect.height // 2),
-            (self.rect.width * 3 // 4, self.rect.height // 2)
-        ]
-        pg.draw.polygon(self.image, (*WHITE, 100), highlight_points)
+    def set_skin(self, name):
+        """Switches to another look from the atlas; its flash frames are built on first use."""
+        image = self.assets.get_image(name)
+        if image:
+            self.skin = name
+            self.original_image = image
+            if not self.is_flashing: self.image = image
 
     def jump(self):
         if self.on_ground:
@@ -74,14 +68,13 @@ class Player(pg.sprite.Sprite):
     def flash(self, color, duration):
         self.flash_color = color
         self.flash_timer = duration
-        self.is_flashing = True
+        self.flash_duration = max(duration, 1e-6)
+        self.flash_frames = self.assets.get_tint_frames(self.skin, color)
+        self.is_flashing = bool(self.flash_frames)
 
     def update(self, dt, **kwargs): # Keep **kwargs
         # Simplified Horizontal Movement
-        self.vel.x = 0
-        keys = pg.key.get_pressed()
-        if keys[pg.K_LEFT]: self.vel.x = -PLAYER_SPEED
-        if keys[pg.K_RIGHT]: self.vel.x = PLAYER_SPEED
+        self.vel.x = self.input_source.get_move_direction(self) * PLAYER_SPEED
         self.pos.x += self.vel.x * dt * FPS
 
         # Vertical Movement (Jump/Gravity)
@@ -112,20 +105,22 @@ class Player(pg.sprite.Sprite):
             self.pos.y = self.rect.centery
             self.vel.y = max(0, self.vel.y)
 
-        # Flashing effect update
-        current_image = self.original_image.copy()
+        # Flashing effect update (picks a pre-tinted frame, no per-frame surfaces)
         if self.is_flashing:
             self.flash_timer -= dt
             if self.flash_timer > 0:
-                flash_surf = pg.Surface(self.original_image.get_size()).convert_alpha()
-                flash_surf.fill(self.flash_color + (100,))
-                current_image.blit(flash_surf, (0,0), special_flags=pg.BLEND_RGBA_ADD)
+                intensity = self.flash_timer / self.flash_duration
+                step = min(len(self.flash_frames) - 1, int(intensity * len(self.flash_frames)))
+                self.image = self.flash_frames[step]
             else:
                 self.is_flashing = False; self.flash_timer = 0
-        self.image = current_image
+                self.image = self.original_image
 
 
-class Item(pg.sprite.Sprite):
+class Item(Entity):
+    __slots__ = ("assets", "type", "pulse_offset", "base_size", "original_image", "pos", "vel")
+    layer = LAYER_ITEMS
+
     def __init__(self, x, item_type, assets):
         super().__init__()
         self.assets = assets
@@ -135,67 +130,19 @@ class Item(pg.sprite.Sprite):
         self.original_image = None
         self.image = None
 
-        if self.type == 'collectible':
-            self.base_size = ITEM_SIZE_COLLECTIBLE
-            self.image = pg.Surface((self.base_size, self.base_size), pg.SRCALPHA)
-            
-            # Draw collectible with gradient and glow
-            center = self.base_size // 2
-            radius = self.base_size // 2 - 2
-            
-            # Outer glow
-            for r in range(radius + 4, radius - 1, -1):
-                alpha = int(100 * (1 - (r - radius) / 4))
-                pg.draw.circle(self.image, (*GREEN, alpha), (center, center), r)
-            
-            # Main circle with gradient
-            for r in range(radius, 0, -1):
-                alpha = int(255 * (1 - r / radius * 0.3))
-                pg.draw.circle(self.image, (*GREEN, alpha), (center, center), r)
-            
-            # Highlight
-            highlight_pos = (center - radius//3, center - radius//3)
-            pg.draw.circle(self.image, (*WHITE, 150), highlight_pos, radius//4)
-            
-            self.original_image = self.image.copy()
-            
-        elif self.type == 'obstacle':
-            self.base_size = ITEM_SIZE_OBSTACLE
-            self.image = pg.Surface((self.base_size, self.base_size), pg.SRCALPHA)
-            
-            # Draw obstacle with gradient and glow
-            rect = self.image.get_rect()
-            center = self.base_size // 2
-            
-            # Outer glow
-            for r in range(3, 0, -1):
-                alpha = int(100 * (1 - r / 3))
-                pg.draw.rect(self.image, (*RED, alpha), rect.inflate(r*2, r*2), border_radius=3)
-            
-            # Main shape with gradient
-            for y in range(self.base_size):
-                alpha = int(255 * (1 - y / self.base_size * 0.3))
-                pg.draw.line(self.image, (*RED, alpha), (0, y), (self.base_size, y))
-            
-            # Add highlight
-            highlight_rect = pg.Rect(0, 0, self.base_size//2, self.base_size//2)
-            highlight_rect.topleft = (self.base_size//4, self.base_size//4)
-            pg.draw.rect(self.image, (*WHITE, 100), highlight_rect, border_radius=2)
-            
-            # Outline
-            pg.draw.rect(self.image, (*BLACK, 180), rect, 2, border_radius=3)
-            
-        else:
-            self.kill()
+        if self.type in ('collectible', 'obstacle'):
+            self.original_image = assets.get_image(self.type)
 
-        if self.image:
+        if self.original_image:
+            self.image = self.original_image
+            self.base_size = self.image.get_width()
             self.rect = self.image.get_rect(center=(x, -self.base_size // 2))
             self.pos = vec(self.rect.center)
             self.vel = vec(0, 0)
         else:
             self.kill()
 
-    def update(self, dt, current_speed):
+    def update(self, dt, current_speed, pulse=True):
         self.vel.y = current_speed
         self.pos.y += self.vel.y * dt * FPS
         self.rect.centery = round(self.pos.y)
@@ -205,21 +152,29 @@ class Item(pg.sprite.Sprite):
             scale_factor = 1.0 + math.sin(pg.time.get_ticks() * 0.001 * COLLECTIBLE_PULSE_SPEED + self.pulse_offset) * COLLECTIBLE_PULSE_AMOUNT
             new_size = max(1, int(self.base_size * scale_factor))
             if abs(scale_factor - 1.0) > 0.01 and new_size != self.rect.width:
-                try:
+                pulse_image = self.assets.get_image(f"collectible@{new_size}") # Pre-baked in the atlas
+                if pulse_image:
                     center = self.rect.center
-                    scaled_image = pg.transform.scale(self.original_image, (new_size, new_size))
-                    self.image = scaled_image
-                    self.rect = self.image.get_rect(center=center)
-                except (pg.error, ValueError):
-                    pass
+                    self.image = pulse_image
+                    self.rect = pulse_image.get_rect(center=center)
+            # Without pulse the rect still pulses, so collisions don't change, but the base look is drawn centred on it
+            if not pulse:
+                self.image = self.original_image
+                self.blit_rect = self.original_image.get_rect(center=self.rect.center)
+            elif self.blit_rect is not None:
+                self.image = self.assets.get_image(f"collectible@{self.rect.width}") or self.original_image
+                self.blit_rect = None
 
         if self.rect.top > SCREEN_HEIGHT + 50:
             self.kill()
 
 # --- PowerUp Class REMOVED ---
 
-class Particle(pg.sprite.Sprite):
-    def __init__(self, pos, vel, size, color, lifetime):
+class Particle(Entity):
+    __slots__ = ("pos", "vel", "size", "color", "lifetime", "life_timer")
+    layer = LAYER_PARTICLES
+
+    def __init__(self, pos, vel, size, color, lifetime, assets):
         super().__init__()
         self.pos = vec(pos)
         self.vel = vec(vel)
@@ -227,7 +182,7 @@ class Particle(pg.sprite.Sprite):
         self.color = color
         self.lifetime = max(0.01, lifetime)
         self.life_timer = 0.0
-        self.image = pg.Surface((self.size, self.size), pg.SRCALPHA)
+        self.image = assets.create_surface((self.size, self.size), alpha=True)
         try: pg.draw.circle(self.image, self.color, (self.size // 2, self.size // 2), self.size // 2)
         except ValueError: self.image.fill(self.color)
         self.rect = self.image.get_rect(center=self.pos)
@@ -4,19 +4,17 @@ import pygame as pg
 from settings import *
 import math
 
-# Store popups globally within this module or pass around
-score_popups = []
-popup_frame_count = 0
-
-# Removed achievement notifications list and functions
-# achievement_notifications = []
-# NOTIFICATION_DURATION = 4.0
+text_cache = {} # (font, text, color) -> rendered surface, so the same text isn't re-rendered (or re-uploaded) every frame
 
 def draw_text(surface, text, size, x, y, color, font, align="center"):
     """Helper function to draw text with alignment."""
     if not font: # Basic fallback if font loading failed
         font = pg.font.SysFont(None, size)
-    text_surface = font.render(text, True, color)
+    key = (font, text, tuple(color))
+    text_surface = text_cache.get(key)
+    if text_surface is None:
+        if len(text_cache) >= TEXT_CACHE_SIZE: text_cache.clear()
+        text_surface = text_cache[key] = font.render(text, True, color).convert_alpha() # Display format, converted once
     text_rect = text_surface.get_rect()
     if align == "center":
         text_rect.center = (x, y)
@@ -35,41 +33,78 @@ def draw_text(surface, text, size, x, y, color, font, align="center"):
     surface.blit(text_surface, text_rect)
     return text_rect
 
-def add_score_popup(position, text="+1", color=YELLOW, assets=None):
-    """Adds a score popup effect."""
-    global popup_frame_count
-    if assets and assets.font_tiny:
-        text_surf = assets.font_tiny.render(text, True, color)
-        rect = text_surf.get_rect(center=position)
-        # Store creation time using Pygame ticks for time-based duration
-        score_popups.append([text_surf, rect, pg.time.get_ticks()])
-
-def update_and_draw_popups(surface, dt):
-    """Updates and draws score popups based on time."""
-    current_time = pg.time.get_ticks()
-    active_popups = []
-    # Convert POPUP_DURATION_FRAMES to milliseconds
-    popup_duration_ms = POPUP_DURATION_FRAMES * (1000.0 / FPS)
-
-    for popup in score_popups:
-        text_surf, rect, creation_time = popup
-        elapsed_time = current_time - creation_time
-
-        if elapsed_time < popup_duration_ms:
-            # Move up based on dt for smooth animation
-            rect.y -= POPUP_SPEED * dt * 60 # Scale speed by FPS if constant is frame-based
-
-            # Calculate alpha based on time elapsed
-            alpha = max(0, 255 * (1 - (elapsed_time / popup_duration_ms)))
-            text_surf.set_alpha(int(alpha))
-            surface.blit(text_surf, rect)
-            active_popups.append(popup)
-    score_popups[:] = active_popups
-
-def clear_popups():
-    """Clears the list of active score popups."""
-    global score_popups
-    score_popups.clear()
+class ScorePopups:
+    """Floating score popups in a fixed-capacity ring buffer, driven by the simulation clock.
+
+    Slots are preallocated and text is pre-rendered as a short ramp of faded
+    frames, so adding and drawing popups allocates nothing once a string is cached.
+    """
+    def __init__(self, assets, capacity=POPUP_CAPACITY):
+        self.assets = assets
+        self.capacity = capacity
+        self.duration = POPUP_DURATION_FRAMES / FPS
+        self.frames = [None] * capacity  # Faded frames of each slot's text
+        self.pos_x = [0] * capacity      # Top-left at spawn
+        self.pos_y = [0] * capacity
+        self.start_time = [0.0] * capacity
+        self.active = [False] * capacity
+        self.live = 0
+        self.head = 0 # Next slot to write; the oldest popup is overwritten when full
+        self.glyph_cache = {} # (text, color) -> tuple of frames, most opaque first
+
+    def get_frames(self, text, color):
+        """Returns the pre-faded frames for `text`, rendering them on first use."""
+        key = (text, color)
+        frames = self.glyph_cache.get(key)
+        if frames is None:
+            if not self.assets or not self.assets.font_tiny: return None
+            if len(self.glyph_cache) >= POPUP_GLYPH_CACHE_SIZE: self.glyph_cache.clear()
+            base = self.assets.to_display_format(self.assets.font_tiny.render(text, True, color))
+            frames = []
+            for step in range(POPUP_FADE_STEPS):
+                frame = self.assets.track(base.copy())
+                alpha = int(255 * (1 - step / POPUP_FADE_STEPS))
+                frame.fill((255, 255, 255, alpha), special_flags=pg.BLEND_RGBA_MULT)
+                frames.append(frame)
+            frames = tuple(frames)
+            self.glyph_cache[key] = frames
+        return frames
+
+    def add(self, position, text, color, now):
+        frames = self.get_frames(text, color)
+        if not frames: return
+        slot = self.head
+        if not self.active[slot]: self.live += 1
+        width, height = frames[0].get_size()
+        self.frames[slot] = frames
+        self.pos_x[slot] = position[0] - width // 2
+        self.pos_y[slot] = position[1] - height // 2
+        self.start_time[slot] = now
+        self.active[slot] = True
+        self.head = (slot + 1) % self.capacity
+
+    def draw(self, surface, now, fade=True):
+        """Draws live popups. Without `fade` they stay fully opaque until they expire."""
+        if not self.live: return
+        rise_speed = POPUP_SPEED * 60 # POPUP_SPEED is in pixels per 60 Hz frame
+        for slot in range(self.capacity):
+            if not self.active[slot]: continue
+            elapsed = now - self.start_time[slot]
+            if elapsed >= self.duration or elapsed < 0:
+                self.active[slot] = False
+                self.frames[slot] = None
+                self.live -= 1
+                continue
+            frames = self.frames[slot]
+            frame = frames[min(len(frames) - 1, int(elapsed / self.duration * len(frames)))] if fade else frames[0]
+            surface.blit(frame, (self.pos_x[slot], self.pos_y[slot] - rise_speed * elapsed))
+
+    def clear(self):
+        for slot in range(self.capacity):
+            self.active[slot] = False
+            self.frames[slot] = None
+        self.live = 0
+        self.head = 0
 
 # --- Removed Achievement Notification functions ---
 # def add_achievement_notification(...)
@@ -79,19 +114,30 @@ def clear_popups():
 # ui.py
 # ... (imports and other functions like draw_text, popups) ...
 
+def draw_overlay(surface, alpha, assets, translucent=True):
+    """Darkens the whole screen with a black overlay of `alpha`.
+
+    Without `translucent` the screen is filled with the color the overlay
+    gives over the dark end of the background, which skips a full-screen
+    alpha blend but hides whatever was drawn underneath.
+    """
+    if translucent:
+        surface.blit(assets.get_panel((SCREEN_WIDTH, SCREEN_HEIGHT), (0, 0, 0, alpha)), (0, 0))
+    else:
+        keep = 1.0 - alpha / 255
+        surface.fill(tuple(int(c * keep) for c in BG_COLOR_DARK_START))
+
 def draw_hud(surface, score, high_score, powerup_timer, powerup_type, assets):
     """Draws the professional Heads Up Display."""
     # Create a semi-transparent background for the score
-    score_bg = pg.Surface((200, 40), pg.SRCALPHA)
-    score_bg.fill((0, 0, 0, 128))
+    score_bg = assets.get_panel((200, 40), (0, 0, 0, 128))
     surface.blit(score_bg, (10, 10))
     
     # Score with improved styling
     draw_text(surface, f"SCORE: {score}", 28, 110, 30, WHITE, assets.font_small, align="center")
     
     # High Score with improved styling
-    high_score_bg = pg.Surface((200, 40), pg.SRCALPHA)
-    high_score_bg.fill((0, 0, 0, 128))
+    high_score_bg = assets.get_panel((200, 40), (0, 0, 0, 128))
     surface.blit(high_score_bg, (SCREEN_WIDTH - 210, 10))
     draw_text(surface, f"BEST: {high_score}", 28, SCREEN_WIDTH - 110, 30, ACCENT, assets.font_small, align="center")
 
@@ -118,8 +164,7 @@ def draw_main_menu(surface, highscore, assets):
     option_font = assets.font_small if assets.font_small else pg.font.SysFont(None, 36)
     
     # Create semi-transparent backgrounds for menu options
-    option_bg = pg.Surface((300, 45), pg.SRCALPHA)
-    option_bg.fill((0, 0, 0, 128))
+    option_bg = assets.get_panel((300, 45), (0, 0, 0, 128))
     
     # Start Game
     surface.blit(option_bg, (SCREEN_WIDTH // 2 - 150, menu_y_start - 22))
@@ -137,18 +182,15 @@ def draw_main_menu(surface, highscore, assets):
     draw_text(surface, "[ Q ]", 24, SCREEN_WIDTH // 2, menu_y_start + line_height * 2 + 25, GRAY, assets.font_tiny, align="center")
 
     # Controls with improved styling
-    controls_bg = pg.Surface((600, 40), pg.SRCALPHA)
-    controls_bg.fill((0, 0, 0, 128))
+    controls_bg = assets.get_panel((600, 40), (0, 0, 0, 128))
     surface.blit(controls_bg, (SCREEN_WIDTH // 2 - 300, SCREEN_HEIGHT - 50))
     controls_text = "CONTROLS: LEFT/RIGHT = Move | UP/SPACE = Jump | P = Pause"
     draw_text(surface, controls_text, 24, SCREEN_WIDTH // 2, SCREEN_HEIGHT - 30, LIGHT_GRAY, assets.font_tiny, align="center")
 
-def draw_game_over(surface, score, highscore, new_highscore, assets):
+def draw_game_over(surface, score, highscore, new_highscore, assets, translucent=True):
     """Draws the professional Game Over screen."""
-    assets.draw_background(surface)
-    overlay = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pg.SRCALPHA)
-    overlay.fill((0, 0, 0, 200))
-    surface.blit(overlay, (0,0))
+    if translucent: assets.draw_background(surface) # Covered by a solid overlay otherwise
+    draw_overlay(surface, 200, assets, translucent)
 
     title_font = assets.font_normal if assets.font_normal else pg.font.SysFont(None, 80)
     score_font = assets.font_small if assets.font_small else pg.font.SysFont(None, 50)
@@ -162,26 +204,22 @@ def draw_game_over(surface, score, highscore, new_highscore, assets):
     # Score Display with improved styling
     y_start = SCREEN_HEIGHT * 0.45
     if new_highscore:
-        new_hs_bg = pg.Surface((300, 45), pg.SRCALPHA)
-        new_hs_bg.fill((0, 0, 0, 128))
+        new_hs_bg = assets.get_panel((300, 45), (0, 0, 0, 128))
         surface.blit(new_hs_bg, (SCREEN_WIDTH // 2 - 150, y_start - 45))
         draw_text(surface, "NEW HIGH SCORE!", 36, SCREEN_WIDTH // 2, y_start - 22, GOLD, info_font, align="center")
     
-    score_bg = pg.Surface((300, 60), pg.SRCALPHA)
-    score_bg.fill((0, 0, 0, 128))
+    score_bg = assets.get_panel((300, 60), (0, 0, 0, 128))
     surface.blit(score_bg, (SCREEN_WIDTH // 2 - 150, y_start))
     draw_text(surface, f"SCORE: {score}", 50, SCREEN_WIDTH // 2, y_start + 30, WHITE, score_font, align="center")
     
-    best_bg = pg.Surface((300, 45), pg.SRCALPHA)
-    best_bg.fill((0, 0, 0, 128))
+    best_bg = assets.get_panel((300, 45), (0, 0, 0, 128))
     surface.blit(best_bg, (SCREEN_WIDTH // 2 - 150, y_start + 70))
     draw_text(surface, f"BEST: {highscore}", 36, SCREEN_WIDTH // 2, y_start + 92, ACCENT, info_font, align="center")
 
     # Options with improved styling
     option_y = SCREEN_HEIGHT * 0.75
     option_spacing = 200
-    option_bg = pg.Surface((150, 45), pg.SRCALPHA)
-    option_bg.fill((0, 0, 0, 128))
+    option_bg = assets.get_panel((150, 45), (0, 0, 0, 128))
     
     # Replay
     surface.blit(option_bg, (SCREEN_WIDTH // 2 - option_spacing - 75, option_y - 22))
@@ -198,11 +236,9 @@ def draw_game_over(surface, score, highscore, new_highscore, assets):
     draw_text(surface, "QUIT", 36, SCREEN_WIDTH // 2 + option_spacing, option_y, WHITE, info_font, align="center")
     draw_text(surface, "[ Q ]", 24, SCREEN_WIDTH // 2 + option_spacing, option_y + 25, GRAY, assets.font_tiny, align="center")
 
-def draw_pause_screen(surface, assets):
+def draw_pause_screen(surface, assets, translucent=True):
     """Draws the professional Pause screen."""
-    overlay = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pg.SRCALPHA)
-    overlay.fill((0, 0, 0, 220))
-    surface.blit(overlay, (0,0))
+    draw_overlay(surface, 220, assets, translucent)
 
     title_font = assets.font_normal if assets.font_normal else pg.font.SysFont(None, 70)
     info_font = assets.font_small if assets.font_small else pg.font.SysFont(None, 36)
@@ -215,8 +251,7 @@ def draw_pause_screen(surface, assets):
     # Options with improved styling
     option_y = SCREEN_HEIGHT * 0.55
     line_height = 60
-    option_bg = pg.Surface((300, 45), pg.SRCALPHA)
-    option_bg.fill((0, 0, 0, 128))
+    option_bg = assets.get_panel((300, 45), (0, 0, 0, 128))
     
     # Resume
     surface.blit(option_bg, (SCREEN_WIDTH // 2 - 150, option_y - 22))
@@ -236,12 +271,36 @@ def draw_pause_screen(surface, assets):
 # --- Removed draw_tutorial ---
 # --- Removed draw_achievements_screen ---
 
-def draw_transition(surface, direction="in", progress=0.0, color=BLACK):
-    """Draws a fade transition."""
-    if progress <= 0: return
-    progress = max(0.0, min(1.0, progress)) # Clamp progress
+class TransitionRenderer:
+    """Draws screen transitions without per-frame allocations.
+
+    Fades and wipes use one cached, display-sized overlay without per-pixel
+    alpha; crossfades blend a cached snapshot of the screen taken when the
+    transition started. Both surfaces live in the Assets surface cache, so
+    they are only rebuilt when the display mode changes.
+    """
+    def __init__(self, assets, kind=TRANSITION_TYPE):
+        self.assets = assets
+        self.kind = kind
+
+    def capture(self, renderer):
+        """Snapshots the last presented frame for a crossfade."""
+        snapshot = self.assets.cached_surface("transition_snapshot", renderer.get_size())
+        renderer.read_pixels(snapshot)
+
+    def draw(self, surface, direction="in", progress=0.0, color=BLACK):
+        if progress <= 0: return
+        progress = max(0.0, min(1.0, progress)) # Clamp progress
+        coverage = progress if direction == "in" else 1.0 - progress
+        size = surface.get_size()
 
-    overlay = pg.Surface(surface.get_size(), pg.SRCALPHA)
-    alpha = int(255 * progress) if direction == "in" else int(255 * (1.0 - progress))
-    overlay.fill(color + (alpha,)) # Add alpha to color tuple
-    surface.blit(overlay, (0,0))
\ No newline at end of file
+        if self.kind == "crossfade":
+            snapshot = self.assets.cached_surface("transition_snapshot", size)
+            snapshot.set_alpha(int(255 * (1.0 - progress)) if direction == "in" else 255)
+            surface.blit(snapshot, (0, 0))
+        elif self.kind == "wipe":
+            surface.fill(color, (0, 0, int(size[0] * coverage), size[1]))
+        else:
+            overlay = self.assets.cached_surface(("transition_overlay", color), size, fill=color)
+            overlay.set_alpha(int(255 * coverage))
+            surface.blit(overlay, (0, 0))